@@ -1,8 +1,9 @@
-import os
 from scanner.network_scanner import NetworkScanner
 from notifications.alert_manager import build_alerts, send_consolidated_alerts
 from report.report_factory import get_reporter
 from utils.summary_manager import update_weekly_summary
+from utils.retention_manager import RetentionManager
+from inventory.device_inventory import write_snapshot
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,15 +15,38 @@ def run_scan_cycle(config):
     scanner = NetworkScanner(config)
     results = scanner.scan()
 
+    process_results(config, results)
+
+
+def process_results(config, results):
+    """Report -> inventory -> alerts -> summary -> retention for one set of results.
+    Shared by the local scan cycle and the distributed collector."""
     # 2. Report
-    reporter = get_reporter(config.get('report_format', 'html'))
-    # You may want to dynamically pick today's log file; hardcode or extend logger to expose path
-    log_file = _get_latest_log_file()
+    # report_format may list several formats; they are rendered in one pass and
+    # alert_attachment_format picks the one attached to the alert email.
+    reporter = get_reporter(
+        config.get('report_format', 'html'),
+        primary=config.get('alert_attachment_format'),
+        parallel=config.get('report_parallelism', 'thread')
+    )
     report_file = reporter.generate(results, log_file=logger.log_file)
-    logger.info(f"Report generated: {report_file}")
+    report_paths = list(getattr(reporter, 'paths', {report_file: report_file}).values())
+    for path in report_paths:
+        logger.info(f"Report generated: {path}")
 
-    # 3. Alerts (unreachable OR latency > threshold)
-    alerts = build_alerts(results, config['latency_threshold'])
+    # Snapshot for the inventory service (whatever report_format is); publishing
+    # additionally pushes the results so lookups see this cycle immediately
+    write_snapshot(results)
+    if config.get('inventory', {}).get('publish'):
+        _publish_inventory(config, results)
+
+    # 3. Alerts (unreachable OR latency/loss/jitter > threshold OR a flagged service)
+    alerts = build_alerts(
+        results, config['latency_threshold'],
+        loss_threshold=config.get('loss_threshold'),
+        jitter_threshold=config.get('jitter_threshold'),
+        service_patterns=config.get('alert_on_services')
+    )
     if alerts:
         send_consolidated_alerts(alerts, config['email'], attachment=report_file)
         logger.info(f"Sent consolidated alert email for {len(alerts)} issues.")
@@ -32,13 +56,19 @@ def run_scan_cycle(config):
     # 4. Update weekly summary
     update_weekly_summary(results)
     logger.info("Weekly summary data updated.")
+
+    # 5. Index this run and apply retention policies to reports/ and logs/
+    retention = RetentionManager(config)
+    extra_reports = [p for p in report_paths if p and p != report_file]
+    retention.record_run(report_file, logger.log_file, results, extra_reports=extra_reports)
+    retention.enforce()
     logger.info("Scan cycle complete.")
 
 
-def _get_latest_log_file():
-    """Best-effort: return latest file in logs/, else None."""
-    logs_dir = "logs"
-    if not os.path.isdir(logs_dir):
-        return None
-    files = [os.path.join(logs_dir, f) for f in os.listdir(logs_dir) if f.endswith(".log")]
-    return max(files, key=os.path.getmtime) if files else None
\ No newline at end of file
+def _publish_inventory(config, results):
+    from inventory.client import InventoryClient
+    try:
+        counts = InventoryClient.from_config(config).publish(results)
+        logger.info(f"Inventory updated: {counts}")
+    except Exception as e:
+        logger.warning(f"Could not publish results to inventory API: {e}")
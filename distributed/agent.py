@@ -0,0 +1,121 @@
+# distributed/agent.py
+import os
+import socket
+import time
+import uuid
+from distributed.frames import encode_frame, read_frame, sign_frame, FrameError
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_COLLECTOR_PORT = 9750
+
+
+class ScanAgent:
+    """
+    Runs the scanner on the local segment and ships results to a central collector.
+
+    Results are split into batches of batch_size devices, encoded as compressed
+    frames and written to an on-disk spool before anything is sent. flush() sends
+    spooled frames oldest-first and deletes each one only after the collector
+    acks it, so frames survive collector outages and agent restarts. A frame the
+    collector explicitly rejects (bad signature, malformed) will never be accepted,
+    so it's moved to spool_dir/rejected/ and newer frames are still delivered.
+    """
+    def __init__(self, config):
+        settings = config.get('agent', {})
+        self.config = config
+        self.site = settings.get('site') or socket.gethostname()
+        self.collector = (settings.get('collector_host', '127.0.0.1'),
+                          settings.get('collector_port', DEFAULT_COLLECTOR_PORT))
+        self.batch_size = settings.get('batch_size', 250)
+        self.spool_dir = settings.get('spool_dir', 'spool')
+        self.max_spool_frames = settings.get('max_spool_frames', 10000)
+        self.timeout = settings.get('timeout_seconds', 10)
+        self.secret = settings.get('secret')
+        self.rejected_dir = os.path.join(self.spool_dir, 'rejected')
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+    def run_cycle(self):
+        """Scan, spool the results and try to deliver everything pending."""
+        from scanner.network_scanner import NetworkScanner
+
+        results = NetworkScanner(self.config).scan()
+        self.spool(results)
+        return self.flush()
+
+    def spool(self, results):
+        """Write one cycle's results as frames to the spool; returns the cycle id."""
+        cycle_id = f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        batches = [results[i:i + self.batch_size] for i in range(0, len(results), self.batch_size)] or [[]]
+        for seq, batch in enumerate(batches):
+            frame = encode_frame(sign_frame({
+                "site": self.site,
+                "cycle_id": cycle_id,
+                "seq": seq,
+                "total": len(batches),
+                "scanned_at": time.time(),
+                "results": batch
+            }, self.secret))
+            path = os.path.join(self.spool_dir, f"{cycle_id}_{seq:05d}.frame")
+            tmp = f"{path}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(frame)
+            os.replace(tmp, path)
+        self._trim_spool()
+        logger.info(f"Spooled cycle {cycle_id}: {len(results)} device(s) in {len(batches)} frame(s)")
+        return cycle_id
+
+    def pending(self):
+        return sorted(name for name in os.listdir(self.spool_dir) if name.endswith('.frame'))
+
+    def rejected(self):
+        if not os.path.isdir(self.rejected_dir):
+            return []
+        return sorted(name for name in os.listdir(self.rejected_dir) if name.endswith('.frame'))
+
+    def _trim_spool(self):
+        pending = self.pending()
+        for name in pending[:max(0, len(pending) - self.max_spool_frames)]:
+            os.remove(os.path.join(self.spool_dir, name))
+            logger.warning(f"Spool full, dropped oldest frame {name}")
+
+    def _reject(self, name, ack):
+        os.makedirs(self.rejected_dir, exist_ok=True)
+        os.replace(os.path.join(self.spool_dir, name), os.path.join(self.rejected_dir, name))
+        logger.error(f"Collector rejected {name} ({ack.get('error')}); moved to {self.rejected_dir}")
+        rejected = self.rejected()
+        for old in rejected[:max(0, len(rejected) - self.max_spool_frames)]:
+            os.remove(os.path.join(self.rejected_dir, old))
+
+    def flush(self):
+        """
+        Send pending frames over one connection; returns how many were acknowledged.
+        Only connection errors leave frames in the spool; rejected frames are set aside.
+        """
+        pending = self.pending()
+        if not pending:
+            return 0
+
+        delivered = rejected = 0
+        try:
+            with socket.create_connection(self.collector, timeout=self.timeout) as sock:
+                for name in pending:
+                    path = os.path.join(self.spool_dir, name)
+                    with open(path, 'rb') as f:
+                        sock.sendall(f.read())
+                    ack = read_frame(sock)
+                    if ack is None:
+                        raise FrameError(f"collector closed the connection before acking {name}")
+                    if not ack.get('ok'):
+                        self._reject(name, ack)
+                        rejected += 1
+                        continue
+                    os.remove(path)
+                    delivered += 1
+        except (OSError, FrameError) as e:
+            logger.warning(f"Collector {self.collector[0]}:{self.collector[1]} unavailable "
+                           f"({e}); {len(pending) - delivered - rejected} frame(s) kept in spool.")
+        else:
+            logger.info(f"Delivered {delivered} frame(s) to collector.")
+        return delivered
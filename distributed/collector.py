@@ -0,0 +1,185 @@
+# distributed/collector.py
+import ipaddress
+import socketserver
+import threading
+import time
+from distributed.frames import read_frame, write_frame, verify_frame, FrameError
+from distributed.agent import DEFAULT_COLLECTOR_PORT
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _is_loopback(host):
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == 'localhost'
+
+
+class SiteState:
+    """Frames of the cycle being assembled plus the last complete cycle for one site."""
+    def __init__(self):
+        self.cycle_id = None
+        self.frames = {}          # seq -> results
+        self.total = 0
+        self.results = []         # last complete cycle
+        self.completed_at = None
+        self.first_seen = time.time()
+
+
+class ScanCollector:
+    """
+    Receives result frames from scan agents and merges them into one inventory.
+
+    A site's cycle becomes visible once all of its frames have arrived. Every
+    flush_interval seconds, if any site completed a new cycle, the merged
+    results of all sites (each device tagged with its "site") go through the
+    normal report -> alerts -> summary pipeline, so there's one report and one
+    alert email for the whole estate.
+
+    A site that hasn't completed a cycle for stale_after_seconds (default twice
+    the flush interval) has its devices reported Unreachable with "site_stale"
+    set, so a dead agent or lost link alerts instead of freezing the site as
+    Reachable. That includes sites whose frames have only ever been rejected.
+    With a shared secret, frames without a valid HMAC are rejected; binding to
+    a non-loopback address requires one.
+    """
+    def __init__(self, config):
+        settings = config.get('collector', {})
+        self.config = config
+        self.address = (settings.get('host', '127.0.0.1'), settings.get('port', DEFAULT_COLLECTOR_PORT))
+        self.flush_interval = settings.get('flush_interval_seconds', 900)
+        self.stale_after = settings.get('stale_after_seconds', 2 * self.flush_interval)
+        self.secret = settings.get('secret')
+        self.sites = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.server = None
+
+    # --- Merging ---
+
+    def ingest(self, frame):
+        """Merge one frame; returns True once the frame's cycle is complete."""
+        site = frame['site']
+        if self.secret:
+            try:
+                verify_frame(frame, self.secret)
+            except FrameError:
+                # Remember the site so it goes stale if it never gets a frame through
+                with self.lock:
+                    self.sites.setdefault(str(site), SiteState())
+                raise
+        cycle_id, seq = frame['cycle_id'], frame['seq']
+        with self.lock:
+            state = self.sites.setdefault(site, SiteState())
+            if state.cycle_id != cycle_id:
+                if state.cycle_id and cycle_id < state.cycle_id:
+                    # A spooled frame from an older cycle arriving late; it's been superseded
+                    return False
+                state.cycle_id, state.frames, state.total = cycle_id, {}, frame['total']
+            state.frames[seq] = frame['results']
+
+            if len(state.frames) < state.total:
+                return False
+            state.results = [
+                dict(device, site=site)
+                for s in sorted(state.frames) for device in state.frames[s]
+            ]
+            state.completed_at = time.time()
+            self.dirty = True
+        logger.info(f"Site {site}: cycle {cycle_id} complete ({len(state.results)} device(s))")
+        return True
+
+    def stale_sites(self, now=None):
+        """Sites whose last complete cycle (or first frame, if none completed) is older than stale_after."""
+        now = now or time.time()
+        with self.lock:
+            return sorted(site for site, state in self.sites.items()
+                          if now - (state.completed_at or state.first_seen) > self.stale_after)
+
+    def merged_results(self, now=None):
+        stale = set(self.stale_sites(now))
+        merged = []
+        with self.lock:
+            for site in sorted(self.sites):
+                for device in self.sites[site].results:
+                    if site in stale:
+                        # Last known inventory, but nothing proves these devices are still up
+                        device = dict(device, status="Unreachable", latency=None, site_stale=True)
+                    merged.append(device)
+        return merged
+
+    def flush(self):
+        """Run the shared pipeline on the merged results if anything changed or a site is stale."""
+        stale = self.stale_sites()
+        with self.lock:
+            if not self.dirty and not stale:
+                return False
+            self.dirty = False
+        for site in stale:
+            logger.warning(f"Site {site}: no complete cycle for over {self.stale_after}s, reporting its devices Unreachable")
+        from app.app import process_results
+
+        results = self.merged_results()
+        logger.info(f"Collector processing {len(results)} device(s) from {len(self.sites)} site(s)")
+        process_results(self.config, results)
+        return True
+
+    # --- Server ---
+
+    def _handler(self):
+        collector = self
+
+        class FrameHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                while True:
+                    try:
+                        frame = read_frame(self.request)
+                    except (FrameError, ValueError, OSError) as e:
+                        logger.warning(f"Dropping connection from {self.client_address[0]}: {e}")
+                        return
+                    if frame is None:
+                        return
+                    try:
+                        collector.ingest(frame)
+                        write_frame(self.request, {"ok": True, "cycle_id": frame['cycle_id'], "seq": frame['seq']})
+                    # The frame was read in full, so the stream is still in sync: reject it
+                    # and keep serving, letting the agent deliver the frames behind it
+                    except FrameError as e:
+                        logger.warning(f"Rejected frame from {self.client_address[0]}: {e}")
+                        write_frame(self.request, {"ok": False, "error": str(e)})
+                    except (KeyError, TypeError, AttributeError) as e:
+                        logger.warning(f"Rejected malformed frame from {self.client_address[0]}: {e}")
+                        write_frame(self.request, {"ok": False, "error": f"malformed frame: {e}"})
+
+        return FrameHandler
+
+    def start(self):
+        """Start accepting agent connections on a background thread."""
+        if not self.secret and not _is_loopback(self.address[0]):
+            raise RuntimeError(f"collector.secret is required to listen on {self.address[0]}")
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer(self.address, self._handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logger.info(f"Collector listening on {self.server.server_address[0]}:{self.server.server_address[1]}")
+        return self.server.server_address
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def serve_forever(self):
+        """Accept frames and flush merged results every flush_interval seconds."""
+        self.start()
+        try:
+            while True:
+                time.sleep(self.flush_interval)
+                self.flush()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.flush()
+            self.stop()
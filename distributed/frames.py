@@ -0,0 +1,96 @@
+# distributed/frames.py
+"""
+Wire format shared by scan agents and the collector.
+
+Every frame is: b"SKY1" | u32 big-endian length | zlib(JSON payload).
+Agents send result frames; the collector answers each with an ack frame.
+Result frames carry an "hmac" field (HMAC-SHA256 over the rest of the payload)
+when agent and collector share a secret.
+"""
+import hashlib
+import hmac
+import json
+import struct
+import zlib
+
+MAGIC = b"SKY1"
+HEADER = struct.Struct("!4sI")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+# A frame may not expand beyond this; stops a small compressed body from ballooning to GBs
+MAX_DECOMPRESSED_BYTES = 256 * 1024 * 1024
+
+
+class FrameError(Exception):
+    """Raised for malformed, oversized or unauthenticated frames."""
+
+
+def encode_frame(payload, level=6):
+    body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), level)
+    return HEADER.pack(MAGIC, len(body)) + body
+
+
+def _decode_body(body, limit):
+    decompressor = zlib.decompressobj()
+    try:
+        data = decompressor.decompress(body, limit)
+    except zlib.error as e:
+        raise FrameError(f"corrupt frame body: {e}")
+    if decompressor.unconsumed_tail:
+        raise FrameError(f"frame expands beyond {limit} bytes")
+    if not decompressor.eof:
+        raise FrameError("truncated frame body")
+    return json.loads(data)
+
+
+def decode_frame(data, limit=MAX_DECOMPRESSED_BYTES):
+    """Decode a complete frame (header + body) as produced by encode_frame."""
+    magic, length = HEADER.unpack_from(data)
+    if magic != MAGIC or len(data) != HEADER.size + length:
+        raise FrameError("bad frame header")
+    return _decode_body(data[HEADER.size:], limit)
+
+
+def _digest(payload, secret):
+    body = json.dumps({k: v for k, v in payload.items() if k != "hmac"}, sort_keys=True, separators=(",", ":"))
+    return hmac.new(secret.encode("utf-8"), body.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def sign_frame(payload, secret):
+    """Return payload with an "hmac" field for secret (unchanged if secret is empty)."""
+    return dict(payload, hmac=_digest(payload, secret)) if secret else payload
+
+
+def verify_frame(payload, secret):
+    """Raise FrameError unless payload carries a valid "hmac" for secret."""
+    signature = payload.get("hmac")
+    if not isinstance(signature, str) or not hmac.compare_digest(signature, _digest(payload, secret)):
+        raise FrameError("frame authentication failed")
+
+
+def _recv_exact(sock, size):
+    chunks, remaining = [], size
+    while remaining:
+        chunk = sock.recv(min(remaining, 65536))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(sock, limit=MAX_DECOMPRESSED_BYTES):
+    """Read one frame from a socket; returns the payload, or None on a clean EOF."""
+    header = _recv_exact(sock, HEADER.size)
+    if header is None:
+        return None
+    magic, length = HEADER.unpack(header)
+    if magic != MAGIC or length > MAX_FRAME_BYTES:
+        raise FrameError("bad frame header")
+    body = _recv_exact(sock, length)
+    if body is None:
+        raise FrameError("connection closed mid-frame")
+    return _decode_body(body, limit)
+
+
+def write_frame(sock, payload):
+    sock.sendall(encode_frame(payload))
@@ -0,0 +1,112 @@
+# inventory/api_server.py
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from inventory.device_inventory import DeviceInventory, SNAPSHOT_FILE
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_PAGE_SIZE = 1000
+
+
+class InventoryRequestHandler(BaseHTTPRequestHandler):
+    """
+    Local JSON API:
+      GET  /devices?mac=&vendor=&hostname=&status=&site=&port=&offset=&limit=
+      GET  /devices/<ip>?site=
+      GET  /stats
+      POST /devices   body: {"results": [...], "replace": false}
+    """
+    inventory = None  # set by serve()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+
+        if url.path == '/stats':
+            return self._send(200, self.inventory.stats())
+
+        if url.path == '/devices':
+            try:
+                offset = int(params.get('offset', ['0'])[0])
+                limit = min(MAX_PAGE_SIZE, int(params.get('limit', ['100'])[0]))
+                ports = [int(p) for value in params.get('port', []) for p in value.split(',') if p]
+            except ValueError:
+                return self._send(400, {"error": "offset, limit and port must be integers"})
+            filters = {k: params[k][0] for k in ('ip', 'mac', 'vendor', 'hostname', 'status', 'site') if k in params}
+            return self._send(200, self.inventory.query(ports=ports, offset=max(0, offset), limit=max(0, limit), **filters))
+
+        if url.path.startswith('/devices/'):
+            device = self.inventory.get(url.path[len('/devices/'):], site=params.get('site', [None])[0])
+            if device is None:
+                return self._send(404, {"error": "device not found"})
+            return self._send(200, device)
+
+        self._send(404, {"error": "unknown endpoint"})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/devices':
+            return self._send(404, {"error": "unknown endpoint"})
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            results = body['results']
+        except (ValueError, KeyError, TypeError):
+            return self._send(400, {"error": "expected JSON body with a 'results' list"})
+        counts = self.inventory.update(results, replace=bool(body.get('replace')))
+        logger.info(f"Inventory updated: {counts}")
+        self._send(200, counts)
+
+    def _send(self, code, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, fmt, *args):
+        pass  # keep the console quiet; updates are logged explicitly
+
+
+def create_server(inventory=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Build (but don't start) the HTTP server around an inventory."""
+    handler = type('BoundInventoryHandler', (InventoryRequestHandler,), {'inventory': inventory or DeviceInventory()})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def watch_snapshot(inventory, interval, path=SNAPSHOT_FILE):
+    """Reload the inventory whenever a finished scan cycle replaces the results snapshot."""
+    last = os.path.getmtime(path) if os.path.exists(path) else None
+    while True:
+        time.sleep(interval)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
+        if mtime != last:
+            last = mtime
+            inventory.load_snapshot(path)
+
+
+def serve(config):
+    """Load the latest run and serve the inventory API until interrupted."""
+    settings = config.get('inventory', {})
+    inventory = DeviceInventory()
+    inventory.load_latest()
+    threading.Thread(target=watch_snapshot, args=(inventory, settings.get('reload_interval_seconds', 30)),
+                     daemon=True).start()
+    server = create_server(inventory, settings.get('host', DEFAULT_HOST), settings.get('port', DEFAULT_PORT))
+    logger.info(f"Inventory API listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,48 @@
+# inventory/client.py
+import json
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+class InventoryClient:
+    """Thin urllib client for the local inventory API (stdlib only, cheap to import)."""
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5):
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+
+    @classmethod
+    def from_config(cls, config):
+        settings = config.get('inventory', {})
+        return cls(settings.get('host', DEFAULT_HOST), settings.get('port', DEFAULT_PORT))
+
+    def _request(self, path, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        req = Request(self.base_url + path, data=data, headers={'Content-Type': 'application/json'})
+        with urlopen(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read())
+
+    def query(self, offset=0, limit=100, ports=None, **filters):
+        params = {k: v for k, v in filters.items() if v is not None}
+        params.update(offset=offset, limit=limit)
+        if ports:
+            params['port'] = ",".join(map(str, ports))
+        return self._request(f"/devices?{urlencode(params)}")
+
+    def get(self, ip, site=None):
+        return self._request(f"/devices/{ip}" + (f"?{urlencode({'site': site})}" if site else ""))
+
+    def stats(self):
+        return self._request("/stats")
+
+    def publish(self, results, replace=False):
+        return self._request("/devices", {"results": results, "replace": replace})
+
+
+def format_device(device):
+    ports = ",".join(map(str, device.get('open_ports') or [])) or "-"
+    return (f"{device.get('ip', ''):<18} {device.get('mac', 'Unknown'):<18} "
+            f"{device.get('status', ''):<12} {device.get('hostname', 'Unknown'):<24} "
+            f"{device.get('vendor', 'Unknown'):<24} {ports}" + (f"  [{device['site']}]" if device.get('site') else ""))
@@ -0,0 +1,245 @@
+# inventory/device_inventory.py
+import gzip
+import ipaddress
+import json
+import os
+import threading
+import time
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Written by every scan cycle regardless of report_format, so the inventory
+# service can seed itself and pick up new cycles without inventory.publish.
+SNAPSHOT_FILE = 'reports/latest_results.json'
+
+# Filters that are answered from an index; everything is matched case-insensitively.
+INDEXED_FIELDS = ('ip', 'mac', 'vendor', 'hostname', 'status', 'site')
+
+
+def normalize_mac(mac):
+    return (mac or '').lower().replace('-', ':')
+
+
+def _key(field, value):
+    if field == 'mac':
+        return normalize_mac(value)
+    return str(value).lower() if value is not None else ''
+
+
+def record_key(device):
+    """Collector results can hold the same (private) IP at several sites, so those are keyed per site."""
+    site = device.get('site')
+    return f"{site}/{device['ip']}" if site else device['ip']
+
+
+def write_snapshot(results, path=SNAPSHOT_FILE):
+    """Atomically replace the latest-results snapshot read by the inventory service."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(results, f)
+    os.replace(tmp, path)
+
+
+def _ip_sort_key(ip):
+    try:
+        addr = ipaddress.ip_address(ip)
+        return (addr.version, int(addr))
+    except ValueError:
+        return (9, 0)
+
+
+class DeviceInventory:
+    """
+    In-memory device table indexed by IP, MAC, vendor, hostname, status, site and open port.
+    Records are keyed by IP, or by site and IP for devices reported by a collector.
+
+    update() applies one scan cycle's results incrementally: only records whose
+    fields changed are re-indexed, and every device seen gets a fresh last_seen.
+    Lookups by any indexed field are dictionary hits.
+    """
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.devices = {}
+        self.indexes = {field: {} for field in INDEXED_FIELDS}
+        self.port_index = {}
+        self.ipv6_index = {}  # IPv6 address -> record keys, for dual-stack devices
+        self.updated_at = None
+
+    # --- Mutation ---
+
+    def update(self, results, replace=False):
+        """
+        Upsert scan results. With replace=True, devices missing from results are dropped
+        (use for full-range cycles). Returns {"added", "changed", "removed"} counts.
+        """
+        added = changed = removed = 0
+        now = time.time()
+        with self.lock:
+            seen = set()
+            for device in results:
+                if not device.get('ip'):
+                    continue
+                key = record_key(device)
+                if key in seen:
+                    logger.warning(f"Duplicate inventory record {key} in one update; keeping the last one")
+                seen.add(key)
+                record = dict(device)
+                record['last_seen'] = now
+                old = self.devices.get(key)
+                if old is None:
+                    added += 1
+                    self._index(key, record)
+                elif self._content(old) != self._content(record):
+                    changed += 1
+                    self._unindex(key, old)
+                    self._index(key, record)
+                self.devices[key] = record
+
+            if replace:
+                for key in [key for key in self.devices if key not in seen]:
+                    self._unindex(key, self.devices.pop(key))
+                    removed += 1
+
+            self.updated_at = now
+        return {"added": added, "changed": changed, "removed": removed}
+
+    @staticmethod
+    def _content(record):
+        return {k: v for k, v in record.items() if k != 'last_seen'}
+
+    def _index(self, key, record):
+        for field in INDEXED_FIELDS:
+            self.indexes[field].setdefault(_key(field, record.get(field)), set()).add(key)
+        for port in record.get('open_ports') or []:
+            self.port_index.setdefault(int(port), set()).add(key)
+        for addr in record.get('ipv6') or []:
+            self.ipv6_index.setdefault(addr.lower(), set()).add(key)
+
+    @staticmethod
+    def _discard(index, value, key):
+        bucket = index.get(value)
+        if bucket:
+            bucket.discard(key)
+            if not bucket:
+                del index[value]
+
+    def _unindex(self, key, record):
+        for field in INDEXED_FIELDS:
+            self._discard(self.indexes[field], _key(field, record.get(field)), key)
+        for port in record.get('open_ports') or []:
+            self._discard(self.port_index, int(port), key)
+        for addr in record.get('ipv6') or []:
+            self._discard(self.ipv6_index, addr.lower(), key)
+
+    # --- Queries ---
+
+    def _keys_for_ip(self, ip):
+        ip = ip.lower()
+        return self.indexes['ip'].get(ip, set()) | self.ipv6_index.get(ip, set())
+
+    def _sort_key(self, key):
+        record = self.devices[key]
+        return _ip_sort_key(record['ip']), record.get('site') or ''
+
+    def get(self, ip, site=None):
+        """The device with this IPv4/IPv6 address; pass site when several sites share the address."""
+        with self.lock:
+            keys = [k for k in self._keys_for_ip(ip) if site is None or self.devices[k].get('site') == site]
+            return dict(self.devices[min(keys, key=self._sort_key)]) if keys else None
+
+    def query(self, ip=None, mac=None, vendor=None, hostname=None, status=None, site=None,
+              ports=None, offset=0, limit=100):
+        """
+        Return devices matching all given filters, sorted by IP (then site) and paginated:
+        {"total": n, "offset": offset, "limit": limit, "items": [...]}.
+        ports is a list of port numbers that must all be open.
+        """
+        with self.lock:
+            candidates = []
+            if ip is not None:
+                candidates.append(self._keys_for_ip(ip))
+            for field, value in (('mac', mac), ('vendor', vendor), ('hostname', hostname),
+                                 ('status', status), ('site', site)):
+                if value is not None:
+                    candidates.append(self.indexes[field].get(_key(field, value), set()))
+            for port in ports or []:
+                candidates.append(self.port_index.get(int(port), set()))
+
+            if candidates:
+                candidates.sort(key=len)
+                matched = set(candidates[0]).intersection(*candidates[1:])
+            else:
+                matched = set(self.devices)
+
+            ordered = sorted(matched, key=self._sort_key)
+            page = [dict(self.devices[k]) for k in ordered[offset:offset + limit]]
+        return {"total": len(ordered), "offset": offset, "limit": limit, "items": page}
+
+    def stats(self):
+        with self.lock:
+            return {
+                "devices": len(self.devices),
+                "vendors": len(self.indexes['vendor']),
+                "ports": sorted(self.port_index),
+                "updated_at": self.updated_at
+            }
+
+    # --- Bootstrap ---
+
+    def load_snapshot(self, path=SNAPSHOT_FILE):
+        """Replace the inventory with the latest-results snapshot. Returns True on success."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load results snapshot {path}: {e}")
+            return False
+        counts = self.update(results, replace=True)
+        logger.info(f"Inventory loaded {len(results)} devices from {path} ({counts})")
+        return True
+
+    def load_latest(self, manifest_file='reports/manifest.json', snapshot_file=SNAPSHOT_FILE):
+        """
+        Seed the inventory from the latest-results snapshot, falling back to the latest
+        run in the retention manifest if its report is machine-readable (json / jsonl
+        export). Returns True on success.
+        """
+        if self.load_snapshot(snapshot_file):
+            return True
+
+        from utils.retention_manager import RetentionManager
+
+        latest = RetentionManager(manifest_file=manifest_file).latest_run()
+        if not latest:
+            return False
+        # Prefer a machine-readable format when the run wrote several.
+        candidates = [latest.get('report')] + latest.get('extra_reports', [])
+        readable = [p for p in candidates if p and ('.jsonl.' in p or p.endswith(('.json', '.json.gz')))]
+        path = (readable or candidates)[0]
+        if not path or not os.path.exists(path):
+            return False
+
+        try:
+            if '.jsonl.' in path:
+                from report.jsonl_reporter import JSONLReporter
+                results = list(JSONLReporter.read_file(path))
+            elif path.endswith('.json'):
+                with open(path, 'r', encoding='utf-8') as f:
+                    results = json.load(f)
+            elif path.endswith('.json.gz'):
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    results = json.load(f)
+            else:
+                logger.info(f"Latest report {path} is not machine-readable; waiting for the next cycle.")
+                return False
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load latest report {path}: {e}")
+            return False
+
+        self.update(results, replace=True)
+        logger.info(f"Inventory loaded {len(results)} devices from {path}")
+        return True
@@ -1,27 +1,109 @@
 import sys
-from utils.logger import get_logger
-from utils.cli import parse_args, apply_overrides
-from utils.config_loader import load_config
-from utils.summary_manager import send_weekly_summary
-from app.app import run_scan_cycle
+from utils.cli import parse_args
 
-logger = get_logger(__name__)
+# Only argparse is imported up front. Everything else is imported inside the
+# code path that needs it so `main.py check` doesn't pay for the scanner,
+# reporters, email modules or log-file creation.
+
+def run_check(args):
+    import json
+    from scanner.quick_check import run_check as quick_check
+
+    ports = args.ports
+    if ports is None:
+        try:
+            from utils.config_loader import load_config
+            ports = load_config().get('ports_to_check', [])
+        except (OSError, json.JSONDecodeError):
+            ports = []
+    return quick_check(args.hosts, ports, timeout=args.timeout, quiet=args.quiet)
+
+def run_inventory(args, config):
+    if args.inventory_command == 'serve':
+        from inventory.api_server import serve
+        serve(config)
+        return 0
+
+    import json
+    from inventory.client import InventoryClient, format_device
+    response = InventoryClient.from_config(config).query(
+        ip=args.filter_ip, mac=args.mac, vendor=args.vendor, hostname=args.hostname,
+        status=args.status, site=args.site, ports=args.port, offset=args.offset, limit=args.limit
+    )
+    if args.json:
+        print(json.dumps(response, indent=2))
+    else:
+        for device in response['items']:
+            print(format_device(device))
+        shown = len(response['items'])
+        print(f"-- {response['offset']}-{response['offset'] + shown} of {response['total']} device(s)")
+    return 0 if response['total'] else 1
+
+def run_passive(args, config):
+    from scanner.passive_listener import PassiveListener, PassiveTable, ingest_pcap
+
+    if args.pcap:
+        table = PassiveTable.load()
+        for path in args.pcap:
+            count = ingest_pcap(path, table)
+            print(f"{path}: {count} observation(s)")
+        table.save()
+        print(f"Passive table: {len(table.entries)} host(s)")
+        return 0
+
+    if args.interface:
+        config.setdefault('passive', {})['interface'] = args.interface
+    listener = PassiveListener(config)
+    try:
+        listener.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
 
 def main():
     args = parse_args()
+
+    # Fast path: single/few-host check, exit code reflects reachability
+    if args.command == 'check':
+        return run_check(args)
+
+    from utils.config_loader import load_config
+    from utils.cli import apply_overrides
     config = apply_overrides(load_config(), args)
 
+    # Passive discovery: live capture or pcap ingest
+    if args.command == 'passive':
+        return run_passive(args, config)
+
+    # Distributed mode: agents scan locally, the collector reports and alerts
+    if args.command == 'agent':
+        from distributed.agent import ScanAgent
+        ScanAgent(config).run_cycle()
+        return 0
+    if args.command == 'collector':
+        from distributed.collector import ScanCollector
+        ScanCollector(config).serve_forever()
+        return 0
+
+    # Inventory API server / query client
+    if args.command == 'inventory':
+        return run_inventory(args, config)
+
     # Weekly summary mode
     if args.weekly_summary:
+        from utils.summary_manager import send_weekly_summary
         send_weekly_summary(config)
-        return
+        return 0
 
     # Normal scan cycle (scan -> report -> alerts -> summary update)
+    from app.app import run_scan_cycle
     run_scan_cycle(config)
+    return 0
 
 if __name__ == "__main__":
     try:
-        main()
+        sys.exit(main())
     except Exception as e:
-        logger.exception(f"Fatal error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        from utils.logger import get_logger
+        get_logger(__name__).exception(f"Fatal error: {e}")
+        sys.exit(1)
@@ -1,10 +1,20 @@
+from html import escape
 from notifications.email_alert import EmailAlert
+from report.schema import matched_services, service_label
 
-def build_alerts(results, latency_threshold):
-    """Return list of devices to alert on."""
+def build_alerts(results, latency_threshold, loss_threshold=None, jitter_threshold=None, service_patterns=None):
+    """
+    Return list of devices to alert on. loss_threshold (%) and jitter_threshold (ms)
+    only apply to devices probed with multiple samples; service_patterns (globs such
+    as "telnet" or "*OpenSSH_7.*") only to devices with service fingerprints.
+    """
     return [
         d for d in results
-        if d['status'] == 'Unreachable' or (d['latency'] and d['latency'] > latency_threshold)
+        if d['status'] == 'Unreachable'
+        or (d['latency'] and d['latency'] > latency_threshold)
+        or (loss_threshold is not None and (d.get('loss') or 0) > loss_threshold)
+        or (jitter_threshold is not None and (d.get('jitter') or 0) > jitter_threshold)
+        or (service_patterns and matched_services(d, service_patterns))
     ]
 
 def send_consolidated_alerts(alerts, email_config, attachment=None):
@@ -23,6 +33,7 @@ def send_consolidated_alerts(alerts, email_config, attachment=None):
                 <th>Hostname</th>
                 <th>Status</th>
                 <th>Latency (ms)</th>
+                <th>Loss / Jitter</th>
                 <th>MAC</th>
                 <th>Vendor</th>
                 <th>Open Ports</th>
@@ -33,14 +44,23 @@ def send_consolidated_alerts(alerts, email_config, attachment=None):
     for d in alerts:
         color = "red" if d['status'] == 'Unreachable' else "orange"
         open_ports = ", ".join(map(str, d['open_ports'])) if d['open_ports'] else "None"
+        if d.get('services'):
+            open_ports = "<br>".join(escape(service_label(s)) for s in d['services'])
+        quality = f"{d['loss']}% / {d['jitter'] if d.get('jitter') is not None else 'N/A'} ms" if d.get('loss') is not None else "N/A"
+        # Device fields can come from remote agents and the network itself, so escape them
+        ip = "<br>".join(escape(str(a)) for a in [d['ip']] + [a for a in d.get('ipv6', []) if a != d['ip']])
+        status = escape(str(d['status']))
+        if d.get('site_stale'):
+            status += f"<br><small>site {escape(str(d.get('site')))} not reporting</small>"
         html += f"""
         <tr>
-            <td>{d['ip']}</td>
-            <td>{d.get('hostname','Unknown')}</td>
-            <td style="color:{color};font-weight:bold;">{d['status']}</td>
+            <td>{ip}</td>
+            <td>{escape(str(d.get('hostname','Unknown')))}</td>
+            <td style="color:{color};font-weight:bold;">{status}</td>
             <td>{d['latency'] if d['latency'] is not None else 'N/A'}</td>
-            <td>{d.get('mac','Unknown')}</td>
-            <td>{d.get('vendor','Unknown')}</td>
+            <td>{quality}</td>
+            <td>{escape(str(d.get('mac','Unknown')))}</td>
+            <td>{escape(str(d.get('vendor','Unknown')))}</td>
             <td>{open_ports}</td>
         </tr>
         """
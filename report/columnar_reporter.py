@@ -0,0 +1,216 @@
+# report/columnar_reporter.py
+import json
+import math
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime
+from report.schema import SCAN_COLUMNS, normalize_row, partition_dir, iter_partitions
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+COLUMNAR_ROOT = "reports/columnar"
+
+# Built-in layout (.skyc), used when pyarrow is not installed:
+#   b"SKYC" | version:u8 | header_len:u32 | header JSON | column blocks...
+# The header lists each column's name, type and compressed block length.
+# Every block is zlib-compressed and little-endian:
+#   timestamp  -> int64 epoch seconds
+#   float      -> float64, NaN for missing values
+#   string     -> u32 dictionary size | dictionary ("\0"-joined UTF-8) | u32 codes
+#                 (code 0 is reserved for None)
+#   list<int>  -> u32 offsets (rows + 1) | u16 values
+#   list<str>  -> u32 offsets (rows + 1) | "\0"-joined UTF-8 values
+SKYC_MAGIC = b"SKYC"
+SKYC_VERSION = 1
+
+
+def _pyarrow():
+    """Return (pyarrow, pyarrow.parquet), or None if pyarrow is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow, pyarrow.parquet
+    except ImportError:
+        return None
+
+
+def _le_bytes(arr):
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _le_array(typecode, data):
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _encode_column(col_type, values):
+    if col_type == "timestamp":
+        return _le_bytes(array("q", values))
+    if col_type == "float":
+        return _le_bytes(array("d", [math.nan if v is None else v for v in values]))
+    if col_type == "list<int>":
+        offsets, flat = array("I", [0]), array("H")
+        for ports in values:
+            flat.extend(ports)
+            offsets.append(len(flat))
+        return _le_bytes(offsets) + _le_bytes(flat)
+    if col_type == "list<str>":
+        offsets, flat = array("I", [0]), []
+        for items in values:
+            flat.extend(items)
+            offsets.append(len(flat))
+        return _le_bytes(offsets) + "\0".join(flat).encode("utf-8")
+
+    # string: dictionary encoded, most columns (status, vendor) are low-cardinality
+    dictionary, codes = {}, array("I")
+    for v in values:
+        if v is None:
+            codes.append(0)
+        else:
+            codes.append(dictionary.setdefault(v, len(dictionary) + 1))
+    words = "\0".join(dictionary).encode("utf-8")
+    return struct.pack("<I", len(dictionary)) + struct.pack("<I", len(words)) + words + _le_bytes(codes)
+
+
+def _decode_column(col_type, data, rows):
+    if col_type == "timestamp":
+        return list(_le_array("q", data))
+    if col_type == "float":
+        return [None if math.isnan(v) else v for v in _le_array("d", data)]
+    if col_type == "list<int>":
+        split = (rows + 1) * 4
+        offsets, flat = _le_array("I", data[:split]), _le_array("H", data[split:])
+        return [list(flat[offsets[i]:offsets[i + 1]]) for i in range(rows)]
+    if col_type == "list<str>":
+        split = (rows + 1) * 4
+        offsets = _le_array("I", data[:split])
+        flat = data[split:].decode("utf-8").split("\0") if offsets[-1] else []
+        return [flat[offsets[i]:offsets[i + 1]] for i in range(rows)]
+
+    size, words_len = struct.unpack_from("<II", data)
+    words = data[8:8 + words_len].decode("utf-8")
+    lookup = [None] + (words.split("\0") if size else [])
+    return [lookup[c] for c in _le_array("I", data[8 + words_len:])]
+
+
+class ColumnarReporter:
+    """
+    Writes scan results column-by-column, partitioned by day:
+    reports/columnar/date=YYYY-MM-DD/scan_HH-MM-SS.parquet when pyarrow is
+    installed, otherwise the compact built-in .skyc layout described above.
+    """
+    def __init__(self, root=COLUMNAR_ROOT):
+        self.root = root
+        self.arrow = _pyarrow()
+
+    def generate(self, results, log_file=None):
+        now = datetime.now()
+        directory = partition_dir(self.root, now)
+        os.makedirs(directory, exist_ok=True)
+
+        scan_time = now.timestamp()
+        rows = [normalize_row(device, scan_time) for device in results]
+        columns = {name: [row[name] for row in rows] for name, _ in SCAN_COLUMNS}
+        stem = f"{directory}/scan_{now.strftime('%H-%M-%S')}"
+
+        if self.arrow:
+            filename = f"{stem}.parquet"
+            self._write_parquet(filename, columns)
+        else:
+            filename = f"{stem}.skyc"
+            self._write_skyc(filename, columns, len(rows))
+        return filename
+
+    def _write_parquet(self, filename, columns):
+        pa, pq = self.arrow
+        types = {
+            "timestamp": pa.timestamp("s"),
+            "string": pa.string(),
+            "float": pa.float64(),
+            "list<int>": pa.list_(pa.uint16()),
+            "list<str>": pa.list_(pa.string()),
+        }
+        schema = pa.schema([(name, types[col_type]) for name, col_type in SCAN_COLUMNS])
+        table = pa.Table.from_pydict(columns, schema=schema)
+        pq.write_table(table, filename, compression="zstd")
+
+    @staticmethod
+    def _write_skyc(filename, columns, rows):
+        blocks, meta = [], []
+        for name, col_type in SCAN_COLUMNS:
+            block = zlib.compress(_encode_column(col_type, columns[name]), 6)
+            blocks.append(block)
+            meta.append({"name": name, "type": col_type, "length": len(block)})
+
+        header = json.dumps({"rows": rows, "columns": meta}, separators=(",", ":")).encode("utf-8")
+        with open(filename, "wb") as f:
+            f.write(SKYC_MAGIC + struct.pack("<BI", SKYC_VERSION, len(header)) + header)
+            for block in blocks:
+                f.write(block)
+
+    @staticmethod
+    def read_skyc(path, columns=None):
+        """Read a .skyc file into {column: [values]}, decoding only the requested columns."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != SKYC_MAGIC:
+            raise ValueError(f"{path} is not a Skynet columnar file")
+        version, header_len = struct.unpack_from("<BI", data, 4)
+        if version != SKYC_VERSION:
+            raise ValueError(f"Unsupported .skyc version {version} in {path}")
+
+        pos = 9
+        header = json.loads(data[pos:pos + header_len])
+        pos += header_len
+        out = {}
+        for col in header["columns"]:
+            block = data[pos:pos + col["length"]]
+            pos += col["length"]
+            if columns is None or col["name"] in columns:
+                out[col["name"]] = _decode_column(col["type"], zlib.decompress(block), header["rows"])
+        return out
+
+    @classmethod
+    def load(cls, start=None, end=None, columns=None, root=COLUMNAR_ROOT):
+        """
+        Load every scan stored between the day partitions start and end
+        ('YYYY-MM-DD', inclusive) into {column: [values]}.
+        Parquet files need pyarrow; .skyc files are read natively.
+        """
+        names = [name for name, _ in SCAN_COLUMNS if columns is None or name in columns]
+        merged = {name: [] for name in names}
+        arrow = None
+        for directory in iter_partitions(root, start, end):
+            for fname in sorted(os.listdir(directory)):
+                path = os.path.join(directory, fname)
+                if fname.endswith(".skyc"):
+                    part = cls.read_skyc(path, names)
+                elif fname.endswith(".parquet"):
+                    arrow = arrow or _pyarrow()
+                    if arrow is None:
+                        raise RuntimeError(f"pyarrow is required to read {path}")
+                    pa, pq = arrow
+                    present = set(pq.read_schema(path).names)
+                    table = pq.read_table(path, columns=[n for n in names if n in present])
+                    if "scan_time" in table.column_names:
+                        idx = table.column_names.index("scan_time")
+                        table = table.set_column(idx, "scan_time", table.column(idx).cast(pa.int64()))
+                    part = table.to_pydict()
+                else:
+                    continue
+                # Files written before a column was added (ipv6, loss, jitter, ...) get None for it,
+                # so every column keeps one value per row
+                rows = max((len(values) for values in part.values()), default=0)
+                for name in names:
+                    merged[name].extend(part.get(name) or [None] * rows)
+        return merged
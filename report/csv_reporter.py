@@ -1,6 +1,7 @@
 import csv
 import os
 from datetime import datetime
+from report.schema import service_label
 
 class CSVReporter:
     def __init__(self):
@@ -8,7 +9,7 @@ class CSVReporter:
 
     def generate(self, results, log_file=None):  # Added log_file arg
         filename = f"reports/report_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.csv"
-        fields = ["ip", "mac", "vendor", "hostname", "status", "latency", "open_ports"]
+        fields = ["ip", "ipv6", "mac", "vendor", "hostname", "status", "latency", "loss", "jitter", "rtt_min", "rtt_max", "open_ports", "services"]
 
         with open(filename, mode='w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=fields)
@@ -17,12 +18,18 @@ class CSVReporter:
             for device in results:
                 writer.writerow({
                     "ip": device["ip"],
+                    "ipv6": " ".join(device.get("ipv6", [])),
                     "mac": device["mac"],
                     "vendor": device["vendor"],
                     "hostname": device["hostname"],
                     "status": device["status"],
                     "latency": device["latency"],
-                    "open_ports": ", ".join(map(str, device["open_ports"])) if device["open_ports"] else "None"
+                    "loss": device.get("loss"),
+                    "jitter": device.get("jitter"),
+                    "rtt_min": device.get("rtt_min"),
+                    "rtt_max": device.get("rtt_max"),
+                    "open_ports": ", ".join(map(str, device["open_ports"])) if device["open_ports"] else "None",
+                    "services": "; ".join(service_label(s) for s in device.get("services", []))
                 })
 
         return filename  # Return file path
\ No newline at end of file
@@ -0,0 +1,60 @@
+# report/fanout_reporter.py
+import pickle
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Formats worth a separate process when parallel="process"; the rest are cheap enough for threads.
+HEAVY_FORMATS = {'html'}
+
+
+def _generate_from_payload(fmt, payload, log_file):
+    """Process-pool entry point: rebuild results from the shared pickle and render one format."""
+    from report.report_factory import get_reporter
+    return get_reporter(fmt).generate(pickle.loads(payload), log_file=log_file)
+
+
+class FanoutReporter:
+    """
+    Generates several report formats from a single scan in parallel.
+
+    generate() returns the path of the primary format (the one attached to alert
+    emails) and stores every path in self.paths ({format: path}).
+    parallel="thread" renders everything on threads; parallel="process" renders
+    heavy formats (HTML) in worker processes from one pickled copy of the results.
+    """
+    def __init__(self, reporters, primary=None, parallel="thread"):
+        self.reporters = reporters  # list of (format, reporter)
+        self.primary = primary if primary in dict(reporters) else reporters[0][0]
+        self.parallel = parallel
+        self.paths = {}
+
+    def generate(self, results, log_file=None):
+        # Serialize once; every worker process reads the same payload.
+        use_processes = self.parallel == "process" and any(fmt in HEAVY_FORMATS for fmt, _ in self.reporters)
+        payload = pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL) if use_processes else None
+
+        futures = {}
+        heavy = sum(1 for fmt, _ in self.reporters if fmt in HEAVY_FORMATS)
+        process_pool = ProcessPoolExecutor(max_workers=heavy) if use_processes else None
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.reporters)) as threads:
+                for fmt, reporter in self.reporters:
+                    if process_pool and fmt in HEAVY_FORMATS:
+                        futures[fmt] = process_pool.submit(_generate_from_payload, fmt, payload, log_file)
+                    else:
+                        futures[fmt] = threads.submit(reporter.generate, results, log_file=log_file)
+
+                self.paths = {}
+                for fmt, future in futures.items():
+                    try:
+                        self.paths[fmt] = future.result()
+                    except Exception as e:
+                        logger.error(f"{fmt} report failed: {e}")
+                        self.paths[fmt] = None
+        finally:
+            if process_pool:
+                process_pool.shutdown()
+
+        return self.paths.get(self.primary)
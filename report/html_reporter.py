@@ -1,5 +1,7 @@
 import os
 from datetime import datetime
+from html import escape
+from report.schema import service_label
 
 class HTMLReporter:
     """
@@ -208,14 +210,30 @@ class HTMLReporter:
                 else:
                     latency_display = f"<span class='text-gray-700 dark:text-gray-300'>{latency_val}</span>"
 
+                # Multi-sample probes add packet loss and jitter under the latency
+                if device.get('loss') is not None:
+                    loss_class = 'text-red-600 dark:text-red-400' if device['loss'] > 0 else 'text-gray-500 dark:text-gray-400'
+                    jitter = device.get('jitter')
+                    latency_display += (
+                        f"<div class='text-xs {loss_class}'>loss {device['loss']}%"
+                        f"{f' · jitter {jitter}' if jitter is not None else ''}</div>"
+                    )
+
                 # Format open ports
                 open_ports = ", ".join(map(str, device.get("open_ports", []))) if device.get("open_ports") else "<span class='text-gray-400 dark:text-gray-500'>None</span>"
+                # Fingerprinted services replace the bare port numbers (banners are remote input, so escaped)
+                if device.get("services"):
+                    open_ports = "".join(f"<div>{escape(service_label(s))}</div>" for s in device["services"])
                 
                 # Sanitize and get device details with fallbacks
                 ip_addr = device.get('ip', 'Unknown')
-                mac_addr = device.get('mac', 'Unknown')
-                vendor = device.get('vendor', 'Unknown')
-                hostname = device.get('hostname', 'Unknown')
+                ipv6_addrs = [a for a in device.get('ipv6', []) if a != ip_addr]
+                ip_addr = escape(str(ip_addr))
+                if ipv6_addrs:
+                    ip_addr += "".join(f"<div class='text-xs font-normal text-gray-500 dark:text-gray-400'>{escape(a)}</div>" for a in ipv6_addrs)
+                mac_addr = escape(str(device.get('mac', 'Unknown')))
+                vendor = escape(str(device.get('vendor', 'Unknown')))
+                hostname = escape(str(device.get('hostname', 'Unknown')))
 
                 html_content += f"""
                     <tr class="hover:bg-gray-50 dark:hover:bg-gray-700/50 transition-colors duration-150">
@@ -0,0 +1,86 @@
+# report/jsonl_reporter.py
+import gzip
+import json
+import os
+from datetime import datetime
+from report.schema import normalize_row, partition_dir, iter_partitions
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+JSONL_ROOT = "reports/jsonl"
+
+
+def _zstd():
+    """Return the zstandard module, or None if it is not installed."""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+class JSONLReporter:
+    """
+    Writes scan results as compressed JSON Lines, one typed row per device,
+    partitioned by day: reports/jsonl/date=YYYY-MM-DD/scan_HH-MM-SS.jsonl.gz
+
+    compression is "gzip" (default) or "zstd"; zstd falls back to gzip
+    when the zstandard package is not installed.
+    """
+    def __init__(self, compression="gzip", root=JSONL_ROOT):
+        self.root = root
+        self.compression = compression
+        if compression == "zstd" and _zstd() is None:
+            logger.warning("zstandard not installed, falling back to gzip for JSONL export.")
+            self.compression = "gzip"
+
+    def generate(self, results, log_file=None):
+        now = datetime.now()
+        directory = partition_dir(self.root, now)
+        os.makedirs(directory, exist_ok=True)
+
+        ext = "zst" if self.compression == "zstd" else "gz"
+        filename = f"{directory}/scan_{now.strftime('%H-%M-%S')}.jsonl.{ext}"
+        scan_time = now.timestamp()
+        payload = "".join(
+            json.dumps(normalize_row(device, scan_time), separators=(",", ":")) + "\n"
+            for device in results
+        ).encode("utf-8")
+
+        if self.compression == "zstd":
+            with open(filename, "wb") as f:
+                f.write(_zstd().ZstdCompressor(level=3).compress(payload))
+        else:
+            with gzip.open(filename, "wb", compresslevel=6) as f:
+                f.write(payload)
+        return filename
+
+    @staticmethod
+    def read_file(path):
+        """Yield rows from a single .jsonl.gz / .jsonl.zst file."""
+        if path.endswith(".zst"):
+            zstd = _zstd()
+            if zstd is None:
+                raise RuntimeError(f"zstandard is required to read {path}")
+            with open(path, "rb") as f:
+                data = zstd.ZstdDecompressor().decompressobj().decompress(f.read())
+            lines = data.decode("utf-8").splitlines()
+        else:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        for line in lines:
+            if line:
+                yield json.loads(line)
+
+    @classmethod
+    def load(cls, start=None, end=None, root=JSONL_ROOT):
+        """
+        Yield every row stored between the day partitions start and end
+        ('YYYY-MM-DD', inclusive). Only the matching partitions are opened.
+        """
+        for directory in iter_partitions(root, start, end):
+            for name in sorted(os.listdir(directory)):
+                if ".jsonl." in name:
+                    yield from cls.read_file(os.path.join(directory, name))
+
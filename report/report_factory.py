@@ -2,17 +2,53 @@
 from report.html_reporter import HTMLReporter
 from report.csv_reporter import CSVReporter
 from report.json_reporter import JSONReporter
+from report.jsonl_reporter import JSONLReporter
+from report.columnar_reporter import ColumnarReporter
+from report.fanout_reporter import FanoutReporter
+from report.schema import REPORT_FORMATS
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-def get_reporter(fmt: str):
-    fmt = (fmt or 'html').lower()
+def parse_formats(fmt):
+    """
+    Normalize report_format (string, comma-separated string or list) into a list of
+    distinct, known formats. Unknown entries are dropped with a warning rather than
+    mapped to HTML, so a typo can't render two HTML reports into the same file.
+    """
+    if isinstance(fmt, (list, tuple)):
+        formats = [str(f).strip().lower() for f in fmt]
+    else:
+        formats = [f.strip().lower() for f in (fmt or 'html').split(',')]
+    unknown = [f for f in formats if f and f not in REPORT_FORMATS]
+    if unknown:
+        logger.warning(f"Ignoring unsupported report format(s) {', '.join(unknown)}; "
+                       f"choose from {', '.join(REPORT_FORMATS)}.")
+    return list(dict.fromkeys(f for f in formats if f in REPORT_FORMATS)) or ['html']
+
+def get_reporter(fmt, primary=None, parallel='thread'):
+    """
+    Return a reporter for fmt. When fmt names several formats, return a FanoutReporter
+    that renders them all in one pass; primary picks the path generate() returns.
+    """
+    formats = parse_formats(fmt)
+    if len(formats) > 1:
+        reporters = [(f, _single_reporter(f)) for f in formats]
+        return FanoutReporter(reporters, primary=(primary or '').lower() or None, parallel=parallel)
+    return _single_reporter(formats[0])
+
+def _single_reporter(fmt: str):
     if fmt == 'html':
         return HTMLReporter()
     if fmt == 'csv':
         return CSVReporter()
     if fmt == 'json':
         return JSONReporter()
+    if fmt == 'jsonl':
+        return JSONLReporter()
+    if fmt == 'jsonl-zstd':
+        return JSONLReporter(compression='zstd')
+    if fmt == 'columnar':
+        return ColumnarReporter()
     logger.warning(f"Unsupported report format '{fmt}', defaulting to HTML.")
-    return HTMLReporter()
\ No newline at end of file
+    return HTMLReporter()
@@ -0,0 +1,89 @@
+# report/schema.py
+import fnmatch
+import os
+from datetime import datetime
+
+# Every value accepted by report_format / --format. Kept here (not in report_factory)
+# so the CLI can validate formats without importing the reporters.
+REPORT_FORMATS = ['html', 'csv', 'json', 'jsonl', 'jsonl-zstd', 'columnar']
+
+# Typed column layout shared by the JSONL and columnar exporters.
+# Types: "timestamp" (epoch seconds), "string", "float", "list<int>", "list<str>".
+SCAN_COLUMNS = [
+    ("scan_time", "timestamp"),
+    ("ip", "string"),
+    ("mac", "string"),
+    ("vendor", "string"),
+    ("hostname", "string"),
+    ("status", "string"),
+    ("latency", "float"),
+    ("loss", "float"),
+    ("jitter", "float"),
+    ("rtt_min", "float"),
+    ("rtt_max", "float"),
+    ("open_ports", "list<int>"),
+    ("ipv6", "list<str>"),
+    ("services", "list<str>"),
+]
+
+PARTITION_PREFIX = "date="
+
+
+def normalize_row(device, scan_time):
+    """Coerce a scanner result dict into a row matching SCAN_COLUMNS."""
+    row = {}
+    for name, col_type in SCAN_COLUMNS:
+        value = scan_time if name == "scan_time" else device.get(name)
+        if name == "services":
+            value = [service_label(s) for s in value or []]
+        if col_type == "timestamp":
+            row[name] = int(value)
+        elif col_type == "float":
+            row[name] = float(value) if value is not None else None
+        elif col_type == "list<int>":
+            row[name] = [int(v) for v in (value or [])]
+        elif col_type == "list<str>":
+            row[name] = [str(v) for v in (value or [])]
+        else:
+            row[name] = str(value) if value is not None else None
+    return row
+
+
+def service_label(service):
+    """'22/ssh OpenSSH_8.9p1' style label for reports and alert matching."""
+    label = f"{service['port']}/{service['service']}"
+    return f"{label} {service['product']}" if service.get('product') else label
+
+
+def matched_services(device, patterns):
+    """Labels of the device's services matching any glob pattern (against the service name or full label)."""
+    matches = []
+    for service in device.get('services') or []:
+        label = service_label(service)
+        if any(fnmatch.fnmatch(service['service'].lower(), p.lower()) or fnmatch.fnmatch(label.lower(), p.lower())
+               for p in patterns):
+            matches.append(label)
+    return matches
+
+
+def partition_dir(root, when: datetime):
+    """Return the day partition directory (root/date=YYYY-MM-DD) for a timestamp."""
+    return f"{root}/{PARTITION_PREFIX}{when.strftime('%Y-%m-%d')}"
+
+
+def iter_partitions(root, start=None, end=None):
+    """Yield day partition directories under root whose date is within [start, end].
+
+    start/end are 'YYYY-MM-DD' strings (inclusive); None means unbounded.
+    """
+    if not os.path.isdir(root):
+        return
+    for name in sorted(os.listdir(root)):
+        if not name.startswith(PARTITION_PREFIX):
+            continue
+        day = name[len(PARTITION_PREFIX):]
+        if start and day < start:
+            continue
+        if end and day > end:
+            continue
+        yield os.path.join(root, name)
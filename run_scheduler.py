@@ -1,10 +1,32 @@
+import os
 import schedule
 import time
 import subprocess
+from utils.config_loader import load_config
+from scanner.scan_journal import JOURNAL_FILE
+
+config = load_config()
 
 def run_scan():
     print("Starting scheduled network scan...")
-    subprocess.run(["python3", "main.py"])  # Runs your existing script
+    # In agent mode the scan ships its results to the collector instead of reporting locally
+    mode = ["agent"] if config.get('agent', {}).get('enabled') else []
+    # A checkpoint left by a crash or reboot is picked up by the next tick (stale or
+    # mismatched checkpoints are discarded by the scanner)
+    resume = ["--resume"] if os.path.exists(JOURNAL_FILE) else []
+    subprocess.run(["python3", "main.py"] + resume + mode)  # Runs your existing script
+
+def start_passive_listener(config):
+    """Sniff ARP/DHCP/mDNS/NetBIOS alongside the scheduler so scans can skip known hosts."""
+    if not config.get('passive', {}).get('enabled'):
+        return None
+    from scanner.passive_listener import PassiveListener
+    listener = PassiveListener(config)
+    listener.start()
+    print("Passive listener running alongside the scheduler.")
+    return listener
+
+start_passive_listener(config)
 
 # Schedule job every 15 minutes
 schedule.every(15).minutes.do(run_scan)
@@ -0,0 +1,174 @@
+# scanner/batch_pinger.py
+import math
+import os
+import platform
+import re
+import select
+import socket
+import struct
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+# Linux/macOS summary lines, Windows summary lines
+_LOSS_RE = re.compile(r'([\d.]+)% packet loss|\((\d+)% loss\)')
+_RTT_RE = re.compile(r'= ([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+) ms')
+_WIN_RTT_RE = re.compile(r'Minimum = (\d+)ms, Maximum = (\d+)ms, Average = (\d+)ms')
+
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _echo_request(ident, seq):
+    payload = struct.pack('!d', time.time()) + b'skynet-probe'
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, _checksum(header + payload), ident, seq) + payload
+
+
+def summarize(sent, rtts):
+    """ping-style statistics from the RTTs (ms) of the replies that came back."""
+    received = len(rtts)
+    stats = {
+        "sent": sent,
+        "received": received,
+        "loss": round(100.0 * (sent - received) / sent, 1) if sent else 100.0,
+        "rtt_min": None, "rtt_avg": None, "rtt_max": None, "jitter": None
+    }
+    if rtts:
+        avg = sum(rtts) / received
+        mdev = math.sqrt(max(0.0, sum(r * r for r in rtts) / received - avg * avg))
+        stats.update(rtt_min=round(min(rtts), 2), rtt_avg=round(avg, 2),
+                     rtt_max=round(max(rtts), 2), jitter=round(mdev, 2))
+    return stats
+
+
+class BatchPinger:
+    """
+    Sends `samples` echo requests to every target in interleaved rounds
+    (round 1 to all hosts, then round 2, ...) from a single ICMP socket, so
+    N samples cost roughly N * interval + timeout of wall time for the
+    whole range rather than per host.
+
+    Uses an unprivileged ICMP datagram socket where the OS allows it
+    (Linux net.ipv4.ping_group_range, macOS), a raw socket when running as
+    root, and otherwise falls back to concurrent `ping -c N` subprocesses.
+    An optional ProbeRateLimiter paces every echo request.
+    """
+    def __init__(self, samples=3, interval=0.2, timeout=1.0, limiter=None):
+        self.samples = max(1, samples)
+        self.interval = interval
+        self.timeout = timeout
+        self.limiter = limiter
+        self.ident = os.getpid() & 0xFFFF
+
+    def ping_all(self, ips):
+        """Return {ip: stats} for every target (see summarize())."""
+        sock, raw = self._open_socket()
+        if sock is None:
+            return self._ping_subprocess(ips)
+        try:
+            return self._ping_socket(sock, raw, ips)
+        finally:
+            sock.close()
+
+    @staticmethod
+    def _open_socket():
+        for sock_type, raw in ((socket.SOCK_DGRAM, False), (socket.SOCK_RAW, True)):
+            try:
+                return socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP), raw
+            except (PermissionError, OSError):
+                continue
+        logger.info("No ICMP socket available; using ping subprocesses for multi-sample probing.")
+        return None, False
+
+    def _ping_socket(self, sock, raw, ips):
+        sock.setblocking(False)
+        sent_at = {}                    # (ip, seq) -> send time
+        rtts = {ip: [] for ip in ips}
+
+        def drain(until):
+            while True:
+                remaining = max(0.0, until - time.perf_counter())
+                ready, _, _ = select.select([sock], [], [], remaining)
+                if not ready:
+                    return
+                try:
+                    data, addr = sock.recvfrom(2048)
+                except (BlockingIOError, InterruptedError):
+                    continue
+                received = time.perf_counter()
+                if len(data) >= 20 and data[0] >> 4 == 4:
+                    data = data[(data[0] & 0x0F) * 4:]   # raw sockets (and macOS) include the IP header
+                if len(data) < 8:
+                    continue
+                icmp_type, _, _, ident, seq = struct.unpack_from('!BBHHH', data)
+                if icmp_type != ICMP_ECHO_REPLY or (raw and ident != self.ident):
+                    continue
+                start = sent_at.pop((addr[0], seq), None)
+                if start is not None and addr[0] in rtts:
+                    rtts[addr[0]].append((received - start) * 1000)
+
+        for seq in range(self.samples):
+            for ip in ips:
+                # Keep reading replies while paced so RTTs aren't inflated by the wait
+                wait = self.limiter.reserve(ip) if self.limiter else 0
+                drain(time.perf_counter() + wait)
+                try:
+                    sock.sendto(_echo_request(self.ident, seq), (ip, 0))
+                    sent_at[(ip, seq)] = time.perf_counter()
+                except OSError:
+                    pass
+            drain(time.perf_counter() + self.interval)
+        drain(time.perf_counter() + self.timeout)
+
+        return {ip: summarize(self.samples, rtts[ip]) for ip in ips}
+
+    def _ping_subprocess(self, ips):
+        with ThreadPoolExecutor(max_workers=min(64, max(1, len(ips)))) as pool:
+            return dict(zip(ips, pool.map(self._ping_one, ips)))
+
+    def _ping_one(self, ip):
+        if self.limiter:
+            self.limiter.acquire(ip, cost=self.samples)
+        if platform.system().lower() == 'windows':
+            command = ['ping', '-n', str(self.samples), '-w', str(int(self.timeout * 1000)), ip]
+        else:
+            command = ['ping', '-c', str(self.samples), '-i', str(max(0.2, self.interval)),
+                       '-W', str(max(1, math.ceil(self.timeout))), ip]
+        try:
+            output = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                    universal_newlines=True).stdout
+        except OSError:
+            return summarize(self.samples, [])
+        return parse_ping_summary(output, self.samples)
+
+
+def parse_ping_summary(output, sent):
+    """Parse the statistics block of ping's output into summarize()-style stats."""
+    stats = summarize(sent, [])
+    loss = _LOSS_RE.search(output)
+    if loss:
+        stats["loss"] = float(loss.group(1) or loss.group(2))
+        stats["received"] = round(sent * (100 - stats["loss"]) / 100)
+    rtt = _RTT_RE.search(output)
+    if rtt:
+        stats.update(rtt_min=float(rtt.group(1)), rtt_avg=float(rtt.group(2)),
+                     rtt_max=float(rtt.group(3)), jitter=float(rtt.group(4)))
+    else:
+        win = _WIN_RTT_RE.search(output)
+        if win:
+            stats.update(rtt_min=float(win.group(1)), rtt_max=float(win.group(2)),
+                         rtt_avg=float(win.group(3)))
+    return stats
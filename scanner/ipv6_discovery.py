@@ -0,0 +1,201 @@
+# scanner/ipv6_discovery.py
+import ipaddress
+import platform
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import netifaces
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ALL_NODES = "ff02::1"
+
+# Linux: "64 bytes from fe80::1%eth0: icmp_seq=1 ttl=64 time=0.41 ms"
+# macOS: "16 bytes from fe80::1%en0, icmp_seq=0 hlim=64 time=0.41 ms"
+_REPLY_RE = re.compile(r'from\s+([0-9a-fA-F:]+?)(?:%[\w.-]+)?[:,]?\s.*?time[=<]([\d.]+)')
+# Linux: "fe80::1 dev eth0 lladdr aa:bb:cc:dd:ee:ff router REACHABLE"
+_NEIGH_RE = re.compile(r'^([0-9a-fA-F:]+)\s+dev\s+(\S+)\s+lladdr\s+([0-9a-fA-F:]{17})\s*(.*)$')
+# macOS ndp -an: "fe80::1%en0   aa:bb:cc:dd:ee:ff   en0 23h59m58s S R"
+_NDP_RE = re.compile(r'^([0-9a-fA-F:]+)(?:%\S+)?\s+([0-9a-fA-F:]{11,17})\s+(\S+)')
+
+_DEAD_STATES = ('FAILED', 'INCOMPLETE')
+# Entries in these states may belong to hosts that have left; they can still be
+# attached to a known device but don't create a new one on their own.
+_STALE_STATES = ('STALE',)
+
+
+def normalize_mac(mac):
+    """Lower-case, colon-separated, zero-padded MAC (ndp prints 'a:b:c:...')."""
+    parts = re.split('[:-]', mac or '')
+    if len(parts) != 6:
+        return None
+    try:
+        return ":".join(f"{int(p, 16):02x}" for p in parts)
+    except ValueError:
+        return None
+
+
+def mac_from_eui64(address):
+    """Recover the MAC from a SLAAC/EUI-64 interface identifier (xx:xx:xxff:fexx:xxxx), else None."""
+    try:
+        iid = ipaddress.IPv6Address(address.split('%')[0]).packed[8:]
+    except ValueError:
+        return None
+    if iid[3:5] != b'\xff\xfe':
+        return None
+    mac = bytes([iid[0] ^ 0x02]) + iid[1:3] + iid[5:8]
+    return ":".join(f"{b:02x}" for b in mac)
+
+
+def preferred_address(addresses):
+    """Global unicast first, then ULA, then link-local; stable within a class."""
+    def rank(addr):
+        ip = ipaddress.IPv6Address(addr.split('%')[0])
+        if ip.is_link_local:
+            return 2
+        if ip.is_private:
+            return 1
+        return 0
+    return sorted(addresses, key=lambda a: (rank(a), a))
+
+
+class IPv6Discovery:
+    """
+    Finds IPv6 hosts without enumerating the address space:
+      1. echo to the all-nodes multicast group ff02::1 on each interface,
+      2. read the kernel neighbor table (populated by step 1 and normal traffic),
+      3. map addresses to MACs via lladdr or the EUI-64 interface identifier.
+    Work is proportional to the number of hosts that answer, not the /64.
+    """
+    def __init__(self, config):
+        settings = config.get("ipv6", {})
+        self.interfaces = settings.get("interfaces") or self._detect_interfaces()
+        self.probe_count = settings.get("probe_count", 2)
+        self.timeout = settings.get("timeout_seconds", 3)
+        self.system = platform.system().lower()
+
+    @staticmethod
+    def _detect_interfaces():
+        interfaces = []
+        for iface in netifaces.interfaces():
+            for addr in netifaces.ifaddresses(iface).get(netifaces.AF_INET6, []):
+                ip = addr.get('addr', '').split('%')[0]
+                if ip and ipaddress.IPv6Address(ip).is_link_local:
+                    interfaces.append(iface)
+                    break
+        return interfaces
+
+    def probe_multicast(self, iface):
+        """Ping ff02::1 on iface; returns {address: rtt_ms} for every responder."""
+        if self.system == 'darwin':
+            commands = [['ping6', '-c', str(self.probe_count), '-I', iface, ALL_NODES]]
+        else:
+            base = ['-c', str(self.probe_count), '-w', str(self.timeout), '-I', iface, ALL_NODES]
+            commands = [['ping', '-6'] + base, ['ping6'] + base]
+
+        for command in commands:
+            try:
+                proc = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                      universal_newlines=True, timeout=self.timeout + 2)
+            except FileNotFoundError:
+                continue
+            except subprocess.TimeoutExpired as e:
+                output = e.stdout or ''
+            else:
+                output = proc.stdout
+            replies = {}
+            for match in _REPLY_RE.finditer(output):
+                addr = match.group(1).lower()
+                if ipaddress.IPv6Address(addr).is_link_local:
+                    addr = f"{addr}%{iface}"
+                replies.setdefault(addr, float(match.group(2)))
+            return replies
+        logger.warning("No IPv6 ping command available; relying on the neighbor table only.")
+        return {}
+
+    def read_neighbors(self):
+        """Return [(address, mac, state)] from the kernel neighbor table, skipping failed entries."""
+        try:
+            if self.system == 'darwin':
+                output = subprocess.check_output(['ndp', '-an'], universal_newlines=True)
+                rows = [m.groups() for m in map(_NDP_RE.match, output.splitlines()) if m]
+                entries = [(addr, iface, mac, '') for addr, mac, iface in rows]
+            else:
+                output = subprocess.check_output(['ip', '-6', 'neigh', 'show'], universal_newlines=True)
+                entries = [m.groups() for m in map(_NEIGH_RE.match, output.splitlines()) if m]
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"IPv6 neighbor table unavailable: {e}")
+            return []
+
+        neighbors = []
+        for addr, iface, mac, state in entries:
+            if any(s in state for s in _DEAD_STATES) or (self.interfaces and iface not in self.interfaces):
+                continue
+            addr = addr.lower()
+            if ipaddress.IPv6Address(addr).is_link_local:
+                addr = f"{addr}%{iface}"
+            neighbors.append((addr, normalize_mac(mac), state))
+        return neighbors
+
+    def discover(self):
+        """
+        Return (hosts, latencies, active):
+          hosts maps MAC -> set of IPv6 addresses (key None collects addresses whose MAC is unknown),
+          latencies maps address -> multicast echo RTT in ms,
+          active is the set of addresses that answered or have a non-stale neighbor entry.
+        """
+        latencies = {}
+        for iface in self.interfaces:
+            latencies.update(self.probe_multicast(iface))
+
+        hosts, active = {}, set(latencies)
+        neighbor_macs = {}
+        for addr, mac, state in self.read_neighbors():
+            neighbor_macs[addr] = mac
+            if not any(s in state for s in _STALE_STATES):
+                active.add(addr)
+        for addr in set(latencies) | set(neighbor_macs):
+            mac = neighbor_macs.get(addr) or mac_from_eui64(addr)
+            hosts.setdefault(mac, set()).add(addr)
+
+        logger.info(f"IPv6 discovery found {len(hosts)} host(s) on {', '.join(self.interfaces) or 'no interfaces'}")
+        return hosts, latencies, active
+
+
+def merge_ipv6(results, hosts, latencies, active, scanner):
+    """
+    Attach IPv6 addresses to existing device records by MAC and append records
+    for active IPv6-only hosts, so they flow into reports and alerts like any other device.
+    Hostname and port probes for the new hosts run on a pool of scanner.scan_workers threads.
+    """
+    by_mac = {normalize_mac(d.get('mac')): d for d in results if normalize_mac(d.get('mac'))}
+    new_hosts = []
+    for mac, addresses in hosts.items():
+        ordered = preferred_address(addresses)
+        device = by_mac.get(mac) if mac else None
+        if device:
+            device['ipv6'] = ordered
+            continue
+
+        candidates = [ordered] if mac else [[addr] for addr in ordered]
+        new_hosts.extend((mac, addrs) for addrs in candidates if any(a in active for a in addrs))
+
+    def enrich(host):
+        mac, addrs = host
+        ip = addrs[0]
+        return {
+            "ip": ip,
+            "status": "Reachable",
+            "latency": next((latencies[a] for a in addrs if a in latencies), None),
+            "hostname": scanner.get_hostname(ip) if '%' not in ip else "Unknown",
+            "mac": mac or "Unknown",
+            "vendor": scanner.lookup_mac_vendor(mac),
+            "open_ports": scanner.check_ports(ip),
+            "ipv6": addrs
+        }
+
+    if new_hosts:
+        with ThreadPoolExecutor(max_workers=min(scanner.scan_workers, len(new_hosts))) as pool:
+            results.extend(pool.map(enrich, new_hosts))
+    return results
@@ -5,6 +5,13 @@ import ipaddress
 import netifaces
 import threading
 import re
+from concurrent.futures import ThreadPoolExecutor
+from scanner.passive_listener import PassiveTable
+from scanner.ipv6_discovery import IPv6Discovery, merge_ipv6
+from scanner.batch_pinger import BatchPinger
+from scanner.rate_limiter import ProbeRateLimiter
+from scanner.scan_journal import ScanJournal
+from scanner.service_fingerprint import ServiceFingerprinter
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,6 +29,34 @@ class NetworkScanner:
 
         self.ip_range = [str(ip) for ip in ipaddress.IPv4Network(self.subnet, strict=False)]
 
+        # Hosts announced via ARP/DHCP/mDNS/NetBIOS within the window skip active probing
+        passive = config.get("passive", {})
+        self.passive_window = passive.get("skip_window_seconds", 900)
+        self.passive_table = PassiveTable.load() if passive.get("enabled") else None
+
+        self.ipv6_enabled = config.get("ipv6", {}).get("enabled", False)
+
+        # probe.samples > 1: N interleaved echoes per host in one batched pass (loss/jitter stats)
+        probe = config.get("probe", {})
+        self.samples = probe.get("samples", 1)
+        self.sample_interval = probe.get("interval_ms", 200) / 1000
+        self.sample_timeout = probe.get("timeout_ms", 1000) / 1000
+        self.ping_stats = {}
+
+        # Token-bucket pacing shared by every probe type (global, per-subnet, per-host)
+        rate_limit = config.get("rate_limit", {})
+        self.limiter = ProbeRateLimiter(config) if rate_limit.get("enabled") else None
+        self.scan_workers = rate_limit.get("workers", 64)
+
+        # Append-only checkpoint journal for large ranges; --resume continues from it
+        self.checkpoint = config.get("checkpoint", {})
+        self.resume = config.get("resume", False)
+        self.journal = None
+
+        # Banner grabbing on open ports, cached between cycles
+        self.fingerprint_enabled = config.get("fingerprint", {}).get("enabled", False)
+        self.config = config
+
     def get_local_subnet(self):
         for iface in netifaces.interfaces():
             addrs = netifaces.ifaddresses(iface)
@@ -38,11 +73,17 @@ class NetworkScanner:
 
         raise RuntimeError("Unable to auto-detect subnet.")
 
+    def pace(self, ip, cost=1):
+        """Wait for the rate limiter (if enabled) before sending cost probes to ip."""
+        if self.limiter:
+            self.limiter.acquire(ip, cost)
+
     def ping_device(self, ip):
         param = '-n' if platform.system().lower() == 'windows' else '-c'
         command = ['ping', param, '1', str(ip)]
 
         try:
+            self.pace(ip)
             output = subprocess.check_output(command, stderr=subprocess.STDOUT, universal_newlines=True)
             if "ttl=" in output.lower() or "time=" in output.lower():
                 latency = None
@@ -57,7 +98,8 @@ class NetworkScanner:
         except subprocess.CalledProcessError:
             return "Unreachable", None
 
-    def get_hostname(self, ip):
+    def get_hostname(self, ip, probe=True):
+        """Reverse DNS first; with probe=True, fall back to NetBIOS and the ping banner."""
         try:
             # Method 1: Reverse DNS
             hostname = socket.gethostbyaddr(ip)[0]
@@ -66,8 +108,13 @@ class NetworkScanner:
         except Exception:
             pass
 
+        # NetBIOS and the ping banner below are IPv4-only
+        if not probe or ':' in str(ip):
+            return "Unknown"
+
         # Method 2: NetBIOS via nmblookup
         try:
+            self.pace(ip)
             output = subprocess.check_output(['nmblookup', '-A', ip], stderr=subprocess.DEVNULL).decode()
             for line in output.splitlines():
                 if '<00>' in line and 'UNIQUE' in line:
@@ -77,6 +124,7 @@ class NetworkScanner:
 
         # Method 3: Try extracting from ping output (some devices show hostnames in parentheses)
         try:
+            self.pace(ip)
             output = subprocess.check_output(['ping', '-c', '1', ip], stderr=subprocess.DEVNULL).decode()
             if '(' in output and ')' in output:
                 # Example: PING my-device (192.168.1.10) → extract my-device
@@ -89,10 +137,12 @@ class NetworkScanner:
 
         return "Unknown"
 
-    def get_mac_address(self, ip):
+    def get_mac_address(self, ip, populate_arp=True):
         try:
-            # Ensure ARP table is populated
-            subprocess.call(['ping', '-c', '1', ip], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            # Ensure ARP table is populated (already done when the batched probe ran)
+            if populate_arp:
+                self.pace(ip)
+                subprocess.call(['ping', '-c', '1', ip], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
             # Linux/macOS: ip neigh
             if platform.system().lower() in ['linux', 'darwin']:
@@ -138,9 +188,11 @@ class NetworkScanner:
 
     def check_ports(self, ip):
         open_ports = []
+        family = socket.AF_INET6 if ':' in str(ip) else socket.AF_INET
         for port in self.ports:
             try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                self.pace(ip)
+                with socket.socket(family, socket.SOCK_STREAM) as s:
                     s.settimeout(0.5)
                     result = s.connect_ex((str(ip), port))
                     if result == 0:
@@ -150,9 +202,30 @@ class NetworkScanner:
         return open_ports
 
     def scan_ip(self, ip):
-        status, latency = self.ping_device(ip)
-        hostname = self.get_hostname(ip)
-        mac = self.get_mac_address(ip)
+        seen = self.passive_table.recent(ip, self.passive_window) if self.passive_table else None
+        if ip in self.ping_stats:
+            stats = self.ping_stats[ip]
+            status = "Reachable" if stats["received"] else "Unreachable"
+            latency = stats["rtt_avg"]
+        else:
+            status, latency = self.ping_device(ip)
+
+        if seen:
+            # Seen recently on the wire: the ping above still decides status (a host that
+            # went quiet must alert), but hostname and MAC come from the passive table
+            # instead of nmblookup / ARP warm-up probes (reverse DNS is still asked when
+            # the host never announced a name)
+            hostname = seen.get("hostname") or self.get_hostname(ip, probe=False)
+            mac = seen["mac"]
+        elif ip in self.ping_stats:
+            hostname = self.get_hostname(ip)
+            mac = self.get_mac_address(ip, populate_arp=False)
+        else:
+            hostname = self.get_hostname(ip)
+            mac = self.get_mac_address(ip)
+            # ARP answered, so the host exists: a failed ping counts as loss for adaptive pacing
+            if self.limiter and mac != "Unknown":
+                self.limiter.record(status == "Reachable")
         open_ports = self.check_ports(ip)
         vendor = self.lookup_mac_vendor(mac)
 
@@ -174,22 +247,94 @@ class NetworkScanner:
             "vendor": vendor,
             "open_ports": open_ports
         }
+        if seen:
+            device_data["discovery"] = "passive"
+        if ip in self.ping_stats:
+            stats = self.ping_stats[ip]
+            device_data.update(
+                loss=stats["loss"], jitter=stats["jitter"],
+                rtt_min=stats["rtt_min"], rtt_max=stats["rtt_max"]
+            )
 
         with self.lock:
             self.results.append(device_data)
             logger.info(f"Scanned {device_data}")
+        return device_data
+
+    def _scan_indexed(self, index, ip):
+        device = self.scan_ip(ip)
+        if self.journal:
+            self.journal.mark_done(index, device)
+
+    def _start_checkpoint(self):
+        """Open the scan journal (restoring progress on resume); returns the (index, ip) pairs left to scan."""
+        pending = list(enumerate(self.ip_range))
+        enabled = self.checkpoint.get("enabled", True)
+        if not (self.resume or (enabled and len(self.ip_range) >= self.checkpoint.get("min_hosts", 256))):
+            return pending
+
+        self.journal = ScanJournal(
+            flush_every=self.checkpoint.get("flush_every", 64),
+            stale_after_hours=self.checkpoint.get("stale_after_hours", 24)
+        )
+        if not self.resume and self.journal.resumable(self.subnet, self.ports):
+            # Don't overwrite an interrupted scan's checkpoint; run this scan without one
+            logger.warning(f"An interrupted scan of {self.subnet} can be resumed with --resume "
+                           f"({self.journal.path}); scanning without a checkpoint.")
+            self.journal = None
+            return pending
+        state = self.journal.load(self.subnet, self.ports) if self.resume else None
+        if state:
+            done, results = state
+            self.results.extend(results)
+            pending = [(i, ip) for i, ip in pending if i not in done]
+        self.journal.open(self.subnet, self.ports, resume=bool(state))
+        return pending
 
     def scan(self):
         logger.info(f"Threaded Scan Starting on Subnet: {self.subnet}")
         threads = []
+        pending = self._start_checkpoint()
+
+        if self.samples > 1:
+            targets = [ip for _, ip in pending]
+            logger.info(f"Batched probe: {self.samples} samples to {len(targets)} host(s)")
+            pinger = BatchPinger(self.samples, self.sample_interval, self.sample_timeout, limiter=self.limiter)
+            self.ping_stats = pinger.ping_all(targets)
+            if self.limiter:
+                # Lost samples to hosts that answered at least once are real loss
+                for stats in self.ping_stats.values():
+                    if stats["received"]:
+                        for i in range(stats["sent"]):
+                            self.limiter.record(i < stats["received"])
 
-        for ip in self.ip_range:
-            t = threading.Thread(target=self.scan_ip, args=(ip,))
-            t.start()
-            threads.append(t)
+        try:
+            if self.limiter:
+                # Paced scans: a bounded pool instead of one thread per address
+                with ThreadPoolExecutor(max_workers=self.scan_workers) as pool:
+                    for future in [pool.submit(self._scan_indexed, i, ip) for i, ip in pending]:
+                        future.result()
+            else:
+                for i, ip in pending:
+                    t = threading.Thread(target=self._scan_indexed, args=(i, ip))
+                    t.start()
+                    threads.append(t)
+
+                for t in threads:
+                    t.join()
+        except BaseException:
+            if self.journal:
+                self.journal.close()   # keep what we have for --resume
+            raise
+
+        if self.journal:
+            self.journal.close(completed=True)
+        logger.info("Threaded Scan Complete.")
 
-        for t in threads:
-            t.join()
+        if self.ipv6_enabled:
+            hosts, latencies, active = IPv6Discovery(self.config).discover()
+            merge_ipv6(self.results, hosts, latencies, active, self)
 
-        logger.info("Threaded Scan Complete.")
-        return self.results
\ No newline at end of file
+        if self.fingerprint_enabled:
+            ServiceFingerprinter(self.config, limiter=self.limiter).fingerprint(self.results)
+        return self.results
\ No newline at end of file
@@ -0,0 +1,233 @@
+# scanner/packet_parsers.py
+"""
+Pure parsers for the broadcast traffic used by passive discovery.
+
+Each parser takes raw bytes and returns observations:
+    {"ip": str, "mac": str | None, "hostname": str | None, "source": "arp" | "dhcp" | "mdns" | "nbns"}
+Malformed packets yield no observations instead of raising.
+"""
+import ipaddress
+import struct
+
+ETH_P_IPV4 = 0x0800
+ETH_P_ARP = 0x0806
+ETH_P_VLAN = (0x8100, 0x88a8)
+
+IP_PROTO_UDP = 17
+
+DHCP_PORTS = (67, 68)
+MDNS_PORT = 5353
+NBNS_PORT = 137
+DHCP_MAGIC = b'\x63\x82\x53\x63'
+
+DNS_TYPE_A = 1
+NBNS_TYPE_NB = 0x20
+
+
+def format_mac(raw):
+    return ":".join(f"{b:02x}" for b in raw)
+
+
+def format_ipv4(raw):
+    return str(ipaddress.IPv4Address(raw))
+
+
+def _usable_ip(ip):
+    return ip not in ("0.0.0.0", "255.255.255.255")
+
+
+# --- Link / network layers ---
+
+def parse_ethernet(frame):
+    """Return (src_mac, ethertype, payload) or None; 802.1Q/802.1ad tags are skipped."""
+    if len(frame) < 14:
+        return None
+    src = format_mac(frame[6:12])
+    ethertype = struct.unpack_from('!H', frame, 12)[0]
+    offset = 14
+    while ethertype in ETH_P_VLAN and len(frame) >= offset + 4:
+        ethertype = struct.unpack_from('!H', frame, offset + 2)[0]
+        offset += 4
+    return src, ethertype, frame[offset:]
+
+
+def parse_ipv4_udp(packet):
+    """Return (src_ip, src_port, dst_port, udp_payload) for unfragmented IPv4/UDP, else None."""
+    if len(packet) < 20 or packet[0] >> 4 != 4:
+        return None
+    ihl = (packet[0] & 0x0F) * 4
+    frag = struct.unpack_from('!H', packet, 6)[0]
+    if packet[9] != IP_PROTO_UDP or frag & 0x1FFF or len(packet) < ihl + 8:
+        return None
+    src_ip = format_ipv4(packet[12:16])
+    src_port, dst_port, length = struct.unpack_from('!HHH', packet, ihl)
+    return src_ip, src_port, dst_port, packet[ihl + 8:ihl + max(8, length)]
+
+
+def parse_arp(packet):
+    """ARP request/reply: the sender's IP/MAC pair (probes from 0.0.0.0 are ignored)."""
+    if len(packet) < 28:
+        return []
+    htype, ptype, hlen, plen = struct.unpack_from('!HHBB', packet, 0)
+    if htype != 1 or ptype != ETH_P_IPV4 or hlen != 6 or plen != 4:
+        return []
+    sender_ip = format_ipv4(packet[14:18])
+    if not _usable_ip(sender_ip):
+        return []
+    return [{"ip": sender_ip, "mac": format_mac(packet[8:14]), "hostname": None, "source": "arp"}]
+
+
+# --- Application layer ---
+
+def parse_dhcp(payload):
+    """
+    DHCP/BOOTP: client MAC from chaddr, IP from ciaddr / requested-IP (option 50)
+    for client messages or yiaddr for server replies, hostname from option 12.
+    """
+    if len(payload) < 240 or payload[236:240] != DHCP_MAGIC:
+        return []
+    op, hlen = payload[0], payload[2]
+    mac = format_mac(payload[28:34]) if hlen == 6 else None
+    ciaddr, yiaddr = format_ipv4(payload[12:16]), format_ipv4(payload[16:20])
+
+    options = {}
+    i = 240
+    while i < len(payload):
+        code = payload[i]
+        if code == 255:
+            break
+        if code == 0:
+            i += 1
+            continue
+        if i + 1 >= len(payload):
+            break
+        length = payload[i + 1]
+        options[code] = payload[i + 2:i + 2 + length]
+        i += 2 + length
+
+    hostname = options.get(12, b'').decode('ascii', errors='ignore').strip('\x00 ') or None
+    if op == 2:
+        ip = yiaddr
+    elif _usable_ip(ciaddr):
+        ip = ciaddr
+    elif len(options.get(50, b'')) == 4:
+        ip = format_ipv4(options[50])
+    else:
+        ip = None
+
+    if not ip or not _usable_ip(ip) or not mac:
+        return []
+    return [{"ip": ip, "mac": mac, "hostname": hostname, "source": "dhcp"}]
+
+
+def _read_name(data, offset, depth=0):
+    """Decode a (possibly compressed) DNS name; returns (labels, next_offset)."""
+    labels = []
+    while offset < len(data):
+        length = data[offset]
+        if length == 0:
+            return labels, offset + 1
+        if length & 0xC0 == 0xC0:
+            if depth > 10 or offset + 1 >= len(data):
+                raise ValueError("bad compression pointer")
+            pointer = struct.unpack_from('!H', data, offset)[0] & 0x3FFF
+            labels += _read_name(data, pointer, depth + 1)[0]
+            return labels, offset + 2
+        labels.append(data[offset + 1:offset + 1 + length])
+        offset += 1 + length
+    raise ValueError("truncated name")
+
+
+def _dns_records(data):
+    """Yield (name_labels, rtype, rdata) for every answer/authority/additional record."""
+    if len(data) < 12:
+        return
+    qd, an, ns, ar = struct.unpack_from('!HHHH', data, 4)
+    offset = 12
+    for _ in range(qd):
+        _, offset = _read_name(data, offset)
+        offset += 4
+    for _ in range(an + ns + ar):
+        labels, offset = _read_name(data, offset)
+        if offset + 10 > len(data):
+            raise ValueError("truncated record")
+        rtype, _, _, rdlength = struct.unpack_from('!HHIH', data, offset)
+        offset += 10
+        yield labels, rtype, data[offset:offset + rdlength]
+        offset += rdlength
+
+
+def parse_mdns(payload, src_ip=None, src_mac=None):
+    """mDNS: A records announce hostname.local -> IP; the MAC is only kept for the sender's own address."""
+    observations = []
+    try:
+        for labels, rtype, rdata in _dns_records(payload):
+            if rtype != DNS_TYPE_A or len(rdata) != 4:
+                continue
+            ip = format_ipv4(rdata)
+            name = ".".join(l.decode('utf-8', errors='ignore') for l in labels)
+            if name.lower().endswith(".local"):
+                name = name[:-len(".local")]
+            observations.append({
+                "ip": ip,
+                "mac": src_mac if ip == src_ip else None,
+                "hostname": name or None,
+                "source": "mdns"
+            })
+    except (ValueError, struct.error):
+        pass
+    return observations
+
+
+def decode_netbios_name(label):
+    """First-level decode of a 32-byte NetBIOS name; returns the 15-char name without padding."""
+    if len(label) != 32:
+        return None
+    raw = bytes(((label[i] - 0x41) << 4) | (label[i + 1] - 0x41) for i in range(0, 32, 2))
+    return raw[:15].decode('ascii', errors='ignore').strip() or None
+
+
+def parse_nbns(payload, src_ip=None, src_mac=None):
+    """NetBIOS name service: NB records (registrations, refreshes, responses) carry name + IP."""
+    observations = []
+    try:
+        for labels, rtype, rdata in _dns_records(payload):
+            if rtype != NBNS_TYPE_NB or len(rdata) < 6 or not labels:
+                continue
+            ip = format_ipv4(rdata[2:6])
+            if not _usable_ip(ip):
+                continue
+            observations.append({
+                "ip": ip,
+                "mac": src_mac if ip == src_ip else None,
+                "hostname": decode_netbios_name(labels[0]),
+                "source": "nbns"
+            })
+    except (ValueError, struct.error):
+        pass
+    return observations
+
+
+def parse_frame(frame):
+    """Parse one Ethernet frame into zero or more observations."""
+    eth = parse_ethernet(frame)
+    if not eth:
+        return []
+    src_mac, ethertype, payload = eth
+
+    if ethertype == ETH_P_ARP:
+        return parse_arp(payload)
+    if ethertype != ETH_P_IPV4:
+        return []
+
+    udp = parse_ipv4_udp(payload)
+    if not udp:
+        return []
+    src_ip, src_port, dst_port, data = udp
+    if src_port in DHCP_PORTS and dst_port in DHCP_PORTS:
+        return parse_dhcp(data)
+    if MDNS_PORT in (src_port, dst_port):
+        return parse_mdns(data, src_ip, src_mac)
+    if NBNS_PORT in (src_port, dst_port):
+        return parse_nbns(data, src_ip, src_mac)
+    return []
@@ -0,0 +1,161 @@
+# scanner/passive_listener.py
+import json
+import os
+import socket
+import threading
+import time
+from scanner.packet_parsers import parse_frame
+from scanner.pcap_reader import read_pcap
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PASSIVE_TABLE_FILE = 'reports/passive_table.json'
+DEFAULT_RETAIN_SECONDS = 86400
+ETH_P_ALL = 0x0003
+
+
+class PassiveTable:
+    """
+    Live IP -> {mac, hostname, last_seen, sources} table fed by passive observations.
+
+    The listener and the scan run in different processes, so the table is
+    persisted to PASSIVE_TABLE_FILE and re-read by NetworkScanner. With max_age
+    set, hosts not seen for that many seconds are dropped on every save.
+    """
+    def __init__(self, path=PASSIVE_TABLE_FILE, max_age=None):
+        self.path = path
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    @classmethod
+    def load(cls, path=PASSIVE_TABLE_FILE, max_age=None):
+        table = cls(path, max_age)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                try:
+                    table.entries = json.load(f)
+                except json.JSONDecodeError:
+                    logger.warning("Passive table is corrupt, starting empty.")
+        return table
+
+    def prune(self, now=None):
+        """Drop entries last seen more than max_age seconds ago; returns how many were dropped."""
+        if not self.max_age:
+            return 0
+        cutoff = (now or time.time()) - self.max_age
+        with self.lock:
+            stale = [ip for ip, entry in self.entries.items() if entry['last_seen'] < cutoff]
+            for ip in stale:
+                del self.entries[ip]
+        return len(stale)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.prune()
+        with self.lock:
+            data = json.dumps(self.entries)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+    def observe(self, observation, seen_at=None):
+        seen_at = seen_at or time.time()
+        with self.lock:
+            entry = self.entries.setdefault(observation['ip'], {
+                "mac": None, "hostname": None, "last_seen": 0, "sources": []
+            })
+            if observation.get('mac'):
+                entry['mac'] = observation['mac']
+            if observation.get('hostname'):
+                entry['hostname'] = observation['hostname']
+            entry['last_seen'] = max(entry['last_seen'], seen_at)
+            if observation['source'] not in entry['sources']:
+                entry['sources'].append(observation['source'])
+
+    def recent(self, ip, window_seconds, now=None):
+        """Return the entry for ip if it was seen within window_seconds and has a MAC, else None."""
+        entry = self.entries.get(ip)
+        if not entry or not entry.get('mac'):
+            return None
+        if (now or time.time()) - entry['last_seen'] > window_seconds:
+            return None
+        return entry
+
+
+def ingest_pcap(path, table):
+    """Feed every frame of a pcap file into table; returns the number of observations."""
+    count = 0
+    for ts, frame in read_pcap(path):
+        for observation in parse_frame(frame):
+            table.observe(observation, seen_at=ts)
+            count += 1
+    return count
+
+
+class PassiveListener:
+    """
+    Sniffs ARP/DHCP/mDNS/NetBIOS broadcasts on a raw AF_PACKET socket (Linux, needs
+    root or CAP_NET_RAW) and keeps a PassiveTable up to date, flushing it to disk
+    every flush_interval seconds.
+    """
+    def __init__(self, config, table=None):
+        settings = config.get('passive', {})
+        self.interface = settings.get('interface')
+        self.flush_interval = settings.get('flush_interval_seconds', 30)
+        self.table = table or PassiveTable.load()
+        # Forget hosts long gone, but never before they could stop mattering to a scan
+        self.table.max_age = max(settings.get('retain_seconds', DEFAULT_RETAIN_SECONDS),
+                                 settings.get('skip_window_seconds', 900))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _open_socket(self):
+        if not hasattr(socket, 'AF_PACKET'):
+            raise RuntimeError("Passive listening requires Linux (AF_PACKET); use --pcap instead.")
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.ntohs(ETH_P_ALL))
+        if self.interface:
+            sock.bind((self.interface, 0))
+        sock.settimeout(1.0)
+        return sock
+
+    def run(self):
+        """Blocking capture loop; returns when stop() is called."""
+        sock = self._open_socket()
+        logger.info(f"Passive listener started on {self.interface or 'all interfaces'}")
+        last_flush = time.time()
+        try:
+            while not self._stop.is_set():
+                try:
+                    frame = sock.recv(65535)
+                except socket.timeout:
+                    frame = None
+                if frame:
+                    for observation in parse_frame(frame):
+                        self.table.observe(observation)
+                if time.time() - last_flush >= self.flush_interval:
+                    self.table.save()
+                    last_flush = time.time()
+        finally:
+            sock.close()
+            self.table.save()
+            logger.info("Passive listener stopped.")
+
+    def start(self):
+        """Run the capture loop on a daemon thread (used alongside the scheduler)."""
+        self._thread = threading.Thread(target=self._run_logged, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def _run_logged(self):
+        try:
+            self.run()
+        except Exception as e:
+            logger.error(f"Passive listener failed: {e}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
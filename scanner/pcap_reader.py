@@ -0,0 +1,48 @@
+# scanner/pcap_reader.py
+import struct
+
+LINKTYPE_ETHERNET = 1
+
+# magic -> (byte order, timestamp divisor)
+PCAP_MAGICS = {
+    b'\xd4\xc3\xb2\xa1': ('<', 1e6),
+    b'\xa1\xb2\xc3\xd4': ('>', 1e6),
+    b'\x4d\x3c\xb2\xa1': ('<', 1e9),
+    b'\xa1\xb2\x3c\x4d': ('>', 1e9),
+}
+
+
+def read_pcap(path):
+    """
+    Yield (timestamp, frame) from a classic libpcap file with Ethernet link type.
+    pcapng is not supported; convert with `editcap -F pcap in.pcapng out.pcap`.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(24)
+        if len(header) < 24 or header[:4] not in PCAP_MAGICS:
+            raise ValueError(f"{path} is not a libpcap file")
+        order, divisor = PCAP_MAGICS[header[:4]]
+        linktype = struct.unpack(f'{order}I', header[20:24])[0] & 0x0FFFFFFF
+        if linktype != LINKTYPE_ETHERNET:
+            raise ValueError(f"{path}: unsupported link type {linktype} (Ethernet only)")
+
+        record = struct.Struct(f'{order}IIII')
+        while True:
+            head = f.read(record.size)
+            if len(head) < record.size:
+                return
+            ts_sec, ts_frac, incl_len, _ = record.unpack(head)
+            frame = f.read(incl_len)
+            if len(frame) < incl_len:
+                return
+            yield ts_sec + ts_frac / divisor, frame
+
+
+def write_pcap(path, frames):
+    """Write (timestamp, frame) pairs as a microsecond libpcap file (handy for recording fixtures)."""
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535, LINKTYPE_ETHERNET))
+        for ts, frame in frames:
+            sec = int(ts)
+            f.write(struct.pack('<IIII', sec, int((ts - sec) * 1e6), len(frame), len(frame)))
+            f.write(frame)
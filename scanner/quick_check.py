@@ -0,0 +1,114 @@
+# scanner/quick_check.py
+"""
+Fast single/few-host health check used by `main.py check`.
+
+Deliberately imports only the standard library: no netifaces, no reporters,
+no email and no logger (which would create a log file), so a check stays
+well under a second from a cold start.
+"""
+import errno
+import math
+import platform
+import socket
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# connect_ex results that prove the host answered even though the port is closed
+_HOST_UP_ERRNOS = {errno.ECONNREFUSED, getattr(errno, 'WSAECONNREFUSED', errno.ECONNREFUSED)}
+
+
+def _ping_command(host, timeout):
+    system = platform.system().lower()
+    if system == 'windows':
+        return ['ping', '-n', '1', '-w', str(int(timeout * 1000)), host]
+    if system == 'darwin':
+        return ['ping', '-c', '1', '-W', str(int(timeout * 1000)), host]
+    return ['ping', '-c', '1', '-W', str(max(1, math.ceil(timeout))), host]
+
+
+def ping_once(host, timeout):
+    """Return RTT in ms, 0.0 if the host replied without a time, or None if no reply."""
+    try:
+        proc = subprocess.run(
+            _ping_command(host, timeout),
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            universal_newlines=True, timeout=timeout + 0.5
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    output = proc.stdout
+    if proc.returncode != 0 or ("ttl=" not in output.lower() and "time=" not in output.lower()):
+        return None
+    if "time=" in output:
+        try:
+            return float(output.split("time=")[-1].split("ms")[0].strip())
+        except ValueError:
+            pass
+    return 0.0
+
+
+def connect_port(host, port, timeout):
+    """Return (host_answered, port_open, rtt_ms) for a single TCP connect."""
+    start = time.perf_counter()
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True, True, (time.perf_counter() - start) * 1000
+    except ConnectionRefusedError:
+        return True, False, (time.perf_counter() - start) * 1000
+    except OSError as e:
+        if e.errno in _HOST_UP_ERRNOS:
+            return True, False, (time.perf_counter() - start) * 1000
+        return False, False, None
+
+
+def check_hosts(hosts, ports, timeout=1.0):
+    """
+    Probe every host with one ping and a TCP connect per port, all concurrently.
+
+    Returns a list of dicts: {"ip", "status", "latency", "open_ports"} in input order.
+    A host is Reachable if it answered the ping or any connect (open or refused).
+    """
+    workers = min(64, max(1, len(hosts) * (len(ports) + 1)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pings = {host: pool.submit(ping_once, host, timeout) for host in hosts}
+        connects = {
+            (host, port): pool.submit(connect_port, host, port, timeout)
+            for host in hosts for port in ports
+        }
+
+        results = []
+        for host in hosts:
+            latency = pings[host].result()
+            answered = latency is not None
+            open_ports = []
+            for port in ports:
+                port_answered, is_open, rtt = connects[(host, port)].result()
+                answered = answered or port_answered
+                if is_open:
+                    open_ports.append(port)
+                if latency is None and rtt is not None:
+                    latency = rtt
+            results.append({
+                "ip": host,
+                "status": "Reachable" if answered else "Unreachable",
+                "latency": round(latency, 2) if latency is not None else None,
+                "open_ports": open_ports
+            })
+        return results
+
+
+def format_result(device):
+    latency = f"{device['latency']} ms" if device['latency'] is not None else "N/A"
+    ports = ",".join(map(str, device['open_ports'])) or "-"
+    state = "UP" if device['status'] == "Reachable" else "DOWN"
+    return f"{device['ip']:<18} {state:<5} {latency:>10}  open: {ports}"
+
+
+def run_check(hosts, ports, timeout=1.0, quiet=False):
+    """Print one line per host and return the exit code (0 = all reachable, 1 otherwise)."""
+    results = check_hosts(hosts, ports, timeout)
+    if not quiet:
+        for device in results:
+            print(format_result(device))
+    return 0 if all(d['status'] == "Reachable" for d in results) else 1
@@ -0,0 +1,134 @@
+# scanner/rate_limiter.py
+import ipaddress
+import threading
+import time
+from collections import deque
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_RATE_LIMIT = {
+    "enabled": False,
+    "pps": 200,              # global probes (packets/connects) per second
+    "burst": 50,             # tokens that may be spent at once
+    "per_subnet_pps": 100,   # per subnet of subnet_prefix size
+    "subnet_prefix": 24,
+    "per_host_pps": 10,
+    "adaptive": True,        # back off the global rate when loss rises
+    "min_pps": 20,
+    "loss_high": 0.2,        # loss ratio that halves the rate
+    "loss_low": 0.05,        # loss ratio below which the rate grows again
+    "increase_pps": 10,      # additive increase per healthy window
+    "window": 50             # outcomes per adjustment
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. reserve() takes tokens immediately (the balance
+    may go negative) and returns how long the caller must wait for the deficit;
+    acquire() sleeps that long outside the lock, so waiting callers are served
+    in arrival order without busy-waiting.
+    """
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, cost=1):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= cost
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def acquire(self, cost=1):
+        wait = self.reserve(cost)
+        if wait:
+            time.sleep(wait)
+
+    def set_rate(self, rate):
+        with self.lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+
+
+class ProbeRateLimiter:
+    """
+    Paces every probe type (ping, ARP resolution, hostname lookups, port connects)
+    through shared token buckets: one global, one per subnet and one per host.
+
+    With adaptive pacing, callers report probe outcomes for hosts known to exist;
+    the global rate is halved when the loss ratio in a window exceeds loss_high
+    and increased additively when it falls below loss_low (AIMD), bounded by
+    min_pps and the configured pps.
+    """
+    def __init__(self, config):
+        self.settings = dict(DEFAULT_RATE_LIMIT)
+        self.settings.update(config.get("rate_limit", {}))
+        s = self.settings
+
+        self.max_pps = s["pps"]
+        self.global_bucket = TokenBucket(s["pps"], s["burst"])
+        self.subnet_buckets = {}
+        self.host_buckets = {}
+        self.buckets_lock = threading.Lock()
+
+        self.outcomes = deque(maxlen=s["window"])
+        self.outcomes_lock = threading.Lock()
+
+    def _bucket(self, table, key, rate):
+        with self.buckets_lock:
+            bucket = table.get(key)
+            if bucket is None:
+                bucket = table[key] = TokenBucket(rate, max(1, rate))
+            return bucket
+
+    def _subnet_key(self, ip):
+        try:
+            prefix = self.settings["subnet_prefix"] if ":" not in ip else 64
+            return str(ipaddress.ip_network(f"{ip.split('%')[0]}/{prefix}", strict=False))
+        except ValueError:
+            return ip
+
+    def reserve(self, ip, cost=1):
+        """Reserve cost probes to ip in every bucket; returns the seconds to wait before sending."""
+        return max(
+            self._bucket(self.host_buckets, ip, self.settings["per_host_pps"]).reserve(cost),
+            self._bucket(self.subnet_buckets, self._subnet_key(ip), self.settings["per_subnet_pps"]).reserve(cost),
+            self.global_bucket.reserve(cost)
+        )
+
+    def acquire(self, ip, cost=1):
+        """Block until cost probes to ip are allowed by the host, subnet and global limits."""
+        wait = self.reserve(ip, cost)
+        if wait:
+            time.sleep(wait)
+
+    def record(self, success):
+        """Report one probe outcome to a host that is known to be present."""
+        if not self.settings["adaptive"]:
+            return
+        with self.outcomes_lock:
+            self.outcomes.append(bool(success))
+            if len(self.outcomes) < self.outcomes.maxlen:
+                return
+            loss = self.outcomes.count(False) / len(self.outcomes)
+            self.outcomes.clear()
+
+        rate = self.global_bucket.rate
+        if loss > self.settings["loss_high"]:
+            new_rate = max(self.settings["min_pps"], rate / 2)
+        elif loss < self.settings["loss_low"]:
+            new_rate = min(self.max_pps, rate + self.settings["increase_pps"])
+        else:
+            return
+        if new_rate != rate:
+            self.global_bucket.set_rate(new_rate)
+            logger.info(f"Probe rate {'reduced' if new_rate < rate else 'raised'} to {new_rate:.0f} pps "
+                        f"(loss {loss:.0%})")
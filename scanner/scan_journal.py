@@ -0,0 +1,153 @@
+# scanner/scan_journal.py
+import hashlib
+import json
+import os
+import threading
+import time
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+JOURNAL_FILE = 'reports/scan_checkpoint.jsonl'
+
+
+def scan_fingerprint(subnet, ports):
+    """Identifies a scan's parameters; a journal from a different scan can't be resumed."""
+    return hashlib.sha1(json.dumps([subnet, sorted(ports)]).encode('utf-8')).hexdigest()[:16]
+
+
+def to_ranges(indices):
+    """[0, 1, 2, 5, 7, 8] -> [[0, 2], [5, 5], [7, 8]]"""
+    ranges = []
+    for i in sorted(indices):
+        if ranges and i == ranges[-1][1] + 1:
+            ranges[-1][1] = i
+        else:
+            ranges.append([i, i])
+    return ranges
+
+
+class ScanJournal:
+    """
+    Append-only JSON Lines checkpoint for long scans.
+
+      {"type": "start", "fingerprint", "subnet", "started_at"}
+      {"type": "progress", "done": [[first, last], ...], "results": [device, ...]}
+
+    The hot loop only appends to an in-memory buffer; every flush_every completed
+    addresses the buffer is written as one "progress" line (index ranges into the
+    scan's address list, plus the devices found). A torn last line from a crash
+    is ignored on load. The journal is deleted when the scan completes.
+    """
+    def __init__(self, path=JOURNAL_FILE, flush_every=64, stale_after_hours=24):
+        self.path = path
+        self.flush_every = flush_every
+        self.stale_after = stale_after_hours * 3600
+        self.lock = threading.Lock()
+        self.pending_done = []
+        self.pending_results = []
+        self.file = None
+
+    def _read(self):
+        """Return (header, done_indices, results) from the journal file, or None if there is none."""
+        if not os.path.exists(self.path):
+            return None
+
+        done, results, header = set(), [], None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break   # torn write at the tail
+                if entry.get('type') == 'start':
+                    header = entry
+                elif entry.get('type') == 'progress':
+                    for first, last in entry['done']:
+                        done.update(range(first, last + 1))
+                    results.extend(entry['results'])
+        return header, done, results
+
+    def _unusable(self, header, subnet, ports):
+        """Why a journal header can't be resumed for this scan, or None if it can."""
+        if not header:
+            return "missing header"
+        if header['fingerprint'] != scan_fingerprint(subnet, ports):
+            return "scan parameters changed"
+        if time.time() - header['started_at'] > self.stale_after:
+            return "checkpoint is stale"
+        return None
+
+    def resumable(self, subnet, ports):
+        """True if a fresh journal for the same scan exists (e.g. left behind by a crash)."""
+        state = self._read()
+        return bool(state) and self._unusable(state[0], subnet, ports) is None
+
+    def load(self, subnet, ports):
+        """
+        Return (done_indices, results) from an existing journal for the same scan,
+        or None if there is none or it is stale / for different parameters (then it is removed).
+        """
+        state = self._read()
+        if not state:
+            return None
+        header, done, results = state
+
+        reason = self._unusable(header, subnet, ports)
+        if reason:
+            logger.warning(f"Discarding scan checkpoint ({reason}).")
+            self.discard()
+            return None
+
+        logger.info(f"Resuming scan: {len(done)} address(es) already done, {len(results)} device(s) restored.")
+        return done, results
+
+    def open(self, subnet, ports, resume=False):
+        """Start a new journal, or keep appending to the one being resumed."""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if resume and os.path.exists(self.path):
+            # Drop a torn tail line so new progress lines stay parseable
+            with open(self.path, 'rb+') as f:
+                data = f.read()
+                f.truncate(data.rfind(b"\n") + 1)
+            self.file = open(self.path, 'a', encoding='utf-8')
+            return
+        self.file = open(self.path, 'w', encoding='utf-8')
+        self._write({"type": "start", "fingerprint": scan_fingerprint(subnet, ports),
+                     "subnet": subnet, "started_at": time.time()})
+
+    def mark_done(self, index, device=None):
+        """Record that address #index finished (with its device record, if any)."""
+        with self.lock:
+            self.pending_done.append(index)
+            if device is not None:
+                self.pending_results.append(device)
+            if len(self.pending_done) >= self.flush_every:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self.pending_done or not self.file:
+            return
+        self._write({"type": "progress", "done": to_ranges(self.pending_done), "results": self.pending_results})
+        self.pending_done, self.pending_results = [], []
+
+    def _write(self, entry):
+        self.file.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self, completed=False):
+        """Flush what's buffered; a completed scan removes its journal."""
+        with self.lock:
+            self._flush_locked()
+            if self.file:
+                self.file.close()
+                self.file = None
+        if completed:
+            self.discard()
+
+    def discard(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,222 @@
+# scanner/service_fingerprint.py
+import json
+import os
+import re
+import socket
+import ssl
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_FILE = 'reports/fingerprint_cache.json'
+
+DEFAULT_FINGERPRINT = {
+    "enabled": False,
+    "timeout_ms": 1500,       # per port, for connect and for each read
+    "workers": 32,
+    "ttl_hours": 24,          # re-grab a cached port after this long
+    "http_ports": [80, 8000, 8008, 8080, 8081, 8888],
+    "tls_ports": [443, 8443],
+    "rdp_ports": [3389]
+}
+
+# TPKT + X.224 Connection Request carrying an RDP Negotiation Request (TLS | CredSSP)
+RDP_CONNECTION_REQUEST = bytes.fromhex("03000013" "0ee00000000000" "0100080003000000")
+_RDP_PROTOCOLS = {0: "standard RDP security", 1: "TLS", 2: "CredSSP/NLA", 8: "RDSTLS"}
+
+_SSH_RE = re.compile(r'^SSH-([\d.]+)-(\S+)')
+_SERVER_RE = re.compile(r'^Server:\s*(.+)$', re.IGNORECASE | re.MULTILINE)
+_MAX_BANNER = 120
+
+
+def _printable(data):
+    text = data.decode('utf-8', errors='replace')
+    return "".join(c if c.isprintable() else ' ' for c in text.split('\n')[0]).strip()[:_MAX_BANNER]
+
+
+def classify(data, tls=False):
+    """Turn the bytes a port sent back into {"service", "product", "banner"}."""
+    if not data:
+        return {"service": "unknown", "product": None, "banner": ""}
+    banner = _printable(data)
+
+    if data[:1] == b'\xff':
+        return {"service": "telnet", "product": None, "banner": ""}
+    ssh = _SSH_RE.match(banner)
+    if ssh:
+        return {"service": "ssh", "product": ssh.group(2), "banner": banner}
+    if data.startswith(b'HTTP/'):
+        server = _SERVER_RE.search(data.decode('latin-1'))
+        return {"service": "https" if tls else "http",
+                "product": server.group(1).strip()[:_MAX_BANNER] if server else None, "banner": banner}
+    if banner.startswith('220'):
+        upper = banner.upper()
+        service = "smtp" if 'SMTP' in upper or 'MAIL' in upper else "ftp" if 'FTP' in upper else "unknown"
+        return {"service": service, "product": banner[4:].strip() or None, "banner": banner}
+    if banner.startswith('+OK'):
+        return {"service": "pop3", "product": banner[3:].strip() or None, "banner": banner}
+    if banner.startswith('* OK'):
+        return {"service": "imap", "product": banner[4:].strip() or None, "banner": banner}
+    return {"service": "unknown", "product": None, "banner": banner}
+
+
+def classify_rdp(data):
+    """Parse the X.224 Connection Confirm (and RDP Negotiation Response) answering RDP_CONNECTION_REQUEST."""
+    if len(data) < 7 or data[0] != 3 or data[5] & 0xF0 != 0xD0:
+        return classify(data)
+    product = None
+    if len(data) >= 19:
+        neg_type, _, _, selected = struct.unpack_from('<BBHI', data, 11)
+        if neg_type == 2:
+            product = _RDP_PROTOCOLS.get(selected, f"protocol {selected}")
+        elif neg_type == 3:
+            product = "negotiation failed"
+    return {"service": "rdp", "product": product, "banner": ""}
+
+
+class FingerprintCache:
+    """
+    Fingerprints keyed by "<MAC or IP>|<port>" with the time they were taken.
+    An entry is reused while it's younger than the TTL and the device still has
+    the same IP; entries for ports that have since closed are dropped, so a
+    reopened port is fingerprinted again.
+    """
+    def __init__(self, path=CACHE_FILE, ttl_hours=24):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable fingerprint cache {path}: {e}")
+
+    @staticmethod
+    def device_key(device):
+        mac = device.get('mac')
+        return mac.lower() if mac and mac != "Unknown" else device['ip']
+
+    def get(self, device, port):
+        entry = self.entries.get(f"{self.device_key(device)}|{port}")
+        if entry and entry['ip'] == device['ip'] and time.time() - entry['checked_at'] < self.ttl:
+            return entry['fingerprint']
+        return None
+
+    def put(self, device, port, fingerprint):
+        self.entries[f"{self.device_key(device)}|{port}"] = {
+            "ip": device['ip'], "checked_at": time.time(), "fingerprint": fingerprint
+        }
+
+    def prune(self, device):
+        """Forget ports of this device that are no longer open."""
+        prefix = f"{self.device_key(device)}|"
+        open_ports = {str(p) for p in device.get('open_ports') or []}
+        for key in [k for k in self.entries if k.startswith(prefix) and k[len(prefix):] not in open_ports]:
+            del self.entries[key]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+
+
+class ServiceFingerprinter:
+    """
+    Identifies what's listening on each device's open ports by grabbing banners
+    concurrently: RDP ports get an X.224 connection request, HTTP(S) ports a
+    HEAD request, and anything else is read for a greeting (SSH, FTP, SMTP, ...)
+    before falling back to HEAD. Only ports missing from the cache (new, reopened,
+    moved to another IP or past the TTL) are contacted. Probes that fail to connect
+    or read are reported as unknown but not cached, so the next cycle retries them.
+    """
+    def __init__(self, config, limiter=None, cache=None):
+        self.settings = dict(DEFAULT_FINGERPRINT)
+        self.settings.update(config.get("fingerprint", {}))
+        self.timeout = self.settings["timeout_ms"] / 1000
+        self.limiter = limiter
+        self.cache = cache or FingerprintCache(ttl_hours=self.settings["ttl_hours"])
+
+    def fingerprint(self, results):
+        """Set device["services"] on every device with open ports; returns how many ports were probed."""
+        services = [{} for _ in results]      # per device: port -> fingerprint
+        jobs = []
+        for found, device in zip(services, results):
+            self.cache.prune(device)
+            for port in device.get('open_ports') or []:
+                cached = self.cache.get(device, port)
+                if cached:
+                    found[port] = cached
+                else:
+                    jobs.append((found, device, port))
+
+        if jobs:
+            logger.info(f"Fingerprinting {len(jobs)} port(s) ({sum(map(len, services))} cached)")
+            with ThreadPoolExecutor(max_workers=min(self.settings["workers"], len(jobs))) as pool:
+                fingerprints = pool.map(lambda job: self.probe(job[1], job[2]), jobs)
+                for (found, device, port), fingerprint in zip(jobs, fingerprints):
+                    if fingerprint is None:
+                        fingerprint = classify(b'')
+                    else:
+                        self.cache.put(device, port, fingerprint)
+                    found[port] = fingerprint
+
+        for found, device in zip(services, results):
+            if found:
+                device['services'] = [dict(found[port], port=port) for port in sorted(found)]
+        self.cache.save()
+        return len(jobs)
+
+    def probe(self, device, port):
+        """Fingerprint one port; returns None if it couldn't be connected to or read."""
+        ip = device['ip']
+        if self.limiter:
+            self.limiter.acquire(ip)
+        try:
+            if port in self.settings["rdp_ports"]:
+                return classify_rdp(self._exchange(ip, port, RDP_CONNECTION_REQUEST))
+            if port in self.settings["tls_ports"]:
+                return classify(self._exchange(ip, port, self._head(ip), tls=True), tls=True)
+            if port in self.settings["http_ports"]:
+                return classify(self._exchange(ip, port, self._head(ip)))
+            greeting = self._exchange(ip, port, None)
+            return classify(greeting if greeting else self._exchange(ip, port, self._head(ip)))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Fingerprint of {ip}:{port} failed: {e}")
+            return None
+
+    @staticmethod
+    def _head(ip):
+        host = f"[{ip.split('%')[0]}]" if ':' in ip else ip
+        return f"HEAD / HTTP/1.0\r\nHost: {host}\r\nUser-Agent: skynet-fingerprint\r\n\r\n".encode('ascii')
+
+    def _exchange(self, ip, port, payload, tls=False):
+        """Connect, optionally send payload, and return what arrives within the timeout."""
+        sock = socket.create_connection((ip, port), timeout=self.timeout)
+        try:
+            if tls:
+                context = ssl.create_default_context()
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+                sock = context.wrap_socket(sock)
+            if payload:
+                sock.sendall(payload)
+            data = b''
+            try:
+                while len(data) < 4096:
+                    chunk = sock.recv(4096)
+                    if not chunk:
+                        break
+                    data += chunk
+                    if payload is None or b'\r\n\r\n' in data or port in self.settings["rdp_ports"]:
+                        break
+            except socket.timeout:
+                pass
+            return data
+        finally:
+            sock.close()
@@ -0,0 +1,13 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def pytest_configure(config):
+    # Modules write logs/ and reports/ relative to the working directory; keep them out of the tree
+    os.chdir(tempfile.mkdtemp(prefix='skynet-tests-'))
@@ -0,0 +1,86 @@
+# tests/pcap_frames.py
+"""
+Builders for the broadcast frames in tests/fixtures/passive_discovery.pcap.
+
+Regenerate the fixture with:  python -m tests.pcap_frames
+"""
+import os
+import socket
+import struct
+from scanner.pcap_reader import write_pcap
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'passive_discovery.pcap')
+BROADCAST = b'\xff' * 6
+BASE_TIME = 1700000000.0
+
+
+def mac(text):
+    return bytes.fromhex(text.replace(':', ''))
+
+
+def ethernet(src, ethertype, payload, dst=BROADCAST, vlan=None):
+    tag = struct.pack('!HH', 0x8100, vlan) if vlan is not None else b''
+    return dst + mac(src) + tag + struct.pack('!H', ethertype) + payload
+
+
+def ipv4_udp(src_ip, dst_ip, src_port, dst_port, payload):
+    udp = struct.pack('!HHHH', src_port, dst_port, 8 + len(payload), 0) + payload
+    header = struct.pack('!BBHHHBBH4s4s', 0x45, 0, 20 + len(udp), 0, 0, 64, 17, 0,
+                         socket.inet_aton(src_ip), socket.inet_aton(dst_ip))
+    return header + udp
+
+
+def arp(sender_mac, sender_ip, target_ip, op=1):
+    body = struct.pack('!HHBBH', 1, 0x0800, 6, 4, op) + mac(sender_mac) + socket.inet_aton(sender_ip) \
+        + b'\x00' * 6 + socket.inet_aton(target_ip)
+    return ethernet(sender_mac, 0x0806, body)
+
+
+def dhcp_request(client_mac, requested_ip, hostname):
+    bootp = struct.pack('!BBBBIHH', 1, 1, 6, 0, 0x1234, 0, 0) + b'\x00' * 16 \
+        + mac(client_mac) + b'\x00' * 10 + b'\x00' * 192 + b'\x63\x82\x53\x63'
+    options = b'\x35\x01\x03' + b'\x32\x04' + socket.inet_aton(requested_ip) \
+        + bytes([12, len(hostname)]) + hostname.encode() + b'\xff'
+    return ethernet(client_mac, 0x0800, ipv4_udp('0.0.0.0', '255.255.255.255', 68, 67, bootp + options))
+
+
+def _dns_name(labels):
+    return b''.join(bytes([len(l)]) + l for l in labels) + b'\x00'
+
+
+def mdns_announcement(src_mac, ip, hostname):
+    header = struct.pack('!HHHHHH', 0, 0x8400, 0, 1, 0, 0)
+    record = _dns_name([hostname.encode(), b'local']) + struct.pack('!HHIH', 1, 0x8001, 120, 4) \
+        + socket.inet_aton(ip)
+    return ethernet(src_mac, 0x0800, ipv4_udp(ip, '224.0.0.251', 5353, 5353, header + record),
+                    dst=mac('01:00:5e:00:00:fb'))
+
+
+def netbios_encode(name):
+    raw = name.upper().ljust(15).encode('ascii') + b'\x00'
+    return bytes(b for c in raw for b in (0x41 + (c >> 4), 0x41 + (c & 0x0F)))
+
+
+def nbns_registration(src_mac, ip, name):
+    header = struct.pack('!HHHHHH', 0x4242, 0x2910, 1, 0, 0, 1)
+    question = _dns_name([netbios_encode(name), b'WORKGROUP']) + struct.pack('!HH', 0x20, 1)
+    additional = b'\xc0\x0c' + struct.pack('!HHIH', 0x20, 1, 300000, 6) + b'\x00\x00' + socket.inet_aton(ip)
+    return ethernet(src_mac, 0x0800, ipv4_udp(ip, '10.0.0.255', 137, 137, header + question + additional))
+
+
+def fixture_frames():
+    """(timestamp, frame) pairs in the order they appear in the fixture."""
+    frames = [
+        arp('00:1b:1b:00:00:01', '10.0.0.10', '10.0.0.1'),
+        dhcp_request('00:1b:1b:00:00:02', '10.0.0.20', 'plc-line2'),
+        mdns_announcement('3c:22:fb:00:00:03', '10.0.0.30', 'printer-3'),
+        nbns_registration('00:15:5d:00:00:04', '10.0.0.40', 'WS-ACCOUNTS'),
+        arp('00:00:00:00:00:00', '0.0.0.0', '10.0.0.50'),                      # ARP probe: ignored
+        ethernet('00:1b:1b:00:00:05', 0x0800, b'\x45\x00'),                     # truncated IPv4: ignored
+    ]
+    return [(BASE_TIME + i, frame) for i, frame in enumerate(frames)]
+
+
+if __name__ == '__main__':
+    write_pcap(FIXTURE, fixture_frames())
+    print(f"Wrote {FIXTURE}")
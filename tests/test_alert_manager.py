@@ -0,0 +1,40 @@
+# tests/test_alert_manager.py
+from notifications.alert_manager import build_alerts
+
+
+def _device(ip, **fields):
+    device = {"ip": ip, "status": "Reachable", "latency": 5.0, "open_ports": []}
+    device.update(fields)
+    return device
+
+
+def _ips(alerts):
+    return [d["ip"] for d in alerts]
+
+
+def test_status_and_latency_always_alert():
+    results = [_device("10.0.0.1"), _device("10.0.0.2", status="Unreachable", latency=None),
+               _device("10.0.0.3", latency=250.0)]
+    assert _ips(build_alerts(results, latency_threshold=100)) == ["10.0.0.2", "10.0.0.3"]
+
+
+def test_loss_threshold():
+    results = [_device("10.0.0.1", loss=0.0), _device("10.0.0.2", loss=20.0), _device("10.0.0.3", loss=60.0),
+               _device("10.0.0.4")]
+    assert _ips(build_alerts(results, 100, loss_threshold=20)) == ["10.0.0.3"]
+    assert _ips(build_alerts(results, 100, loss_threshold=0)) == ["10.0.0.2", "10.0.0.3"]
+    # Without a threshold, loss is not an alert condition
+    assert build_alerts(results, 100) == []
+
+
+def test_jitter_threshold():
+    results = [_device("10.0.0.1", jitter=1.5), _device("10.0.0.2", jitter=12.0),
+               _device("10.0.0.3", jitter=None)]
+    assert _ips(build_alerts(results, 100, jitter_threshold=10)) == ["10.0.0.2"]
+    assert build_alerts(results, 100, loss_threshold=50) == []
+
+
+def test_loss_and_jitter_combine():
+    results = [_device("10.0.0.1", loss=40.0, jitter=1.0), _device("10.0.0.2", loss=0.0, jitter=30.0),
+               _device("10.0.0.3", loss=0.0, jitter=1.0)]
+    assert _ips(build_alerts(results, 100, loss_threshold=25, jitter_threshold=20)) == ["10.0.0.1", "10.0.0.2"]
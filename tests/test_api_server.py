@@ -0,0 +1,68 @@
+# tests/test_api_server.py
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+
+from inventory.api_server import create_server
+from inventory.device_inventory import DeviceInventory
+
+DEVICES = [
+    {"ip": f"10.0.0.{i}", "mac": f"aa:bb:cc:dd:ee:{i:02x}", "vendor": "Siemens AG" if i % 2 else "Dell Inc.",
+     "hostname": f"host-{i}", "status": "Reachable", "open_ports": [102] if i % 2 else [22]}
+    for i in range(1, 6)
+]
+
+
+@pytest.fixture
+def api():
+    inventory = DeviceInventory()
+    inventory.update(DEVICES)
+    server = create_server(inventory, host="127.0.0.1", port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _call(url, body=None):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_devices_filters_and_pages(api):
+    status, page = _call(f"{api}/devices?vendor=siemens%20ag&offset=1&limit=1")
+    assert status == 200
+    assert page["total"] == 3
+    assert [d["ip"] for d in page["items"]] == ["10.0.0.3"]
+
+    status, page = _call(f"{api}/devices?port=102&hostname=host-5")
+    assert [d["ip"] for d in page["items"]] == ["10.0.0.5"]
+
+    assert _call(f"{api}/devices?limit=abc")[0] == 400
+
+
+def test_device_lookup_and_stats(api):
+    assert _call(f"{api}/devices/10.0.0.2")[1]["hostname"] == "host-2"
+    assert _call(f"{api}/devices/10.9.9.9")[0] == 404
+
+    status, stats = _call(f"{api}/stats")
+    assert status == 200
+    assert stats["devices"] == 5
+    assert stats["ports"] == [22, 102]
+
+
+def test_post_applies_incremental_update(api):
+    status, counts = _call(f"{api}/devices", {"results": [dict(DEVICES[0], hostname="renamed")], "replace": True})
+    assert status == 200
+    assert counts == {"added": 0, "changed": 1, "removed": 4}
+    assert _call(f"{api}/devices")[1]["total"] == 1
+
+    assert _call(f"{api}/devices", {"devices": []})[0] == 400
+    assert _call(f"{api}/nope")[0] == 404
@@ -0,0 +1,64 @@
+# tests/test_batch_pinger.py
+import pytest
+
+from scanner.batch_pinger import parse_ping_summary, summarize
+
+LINUX_OUTPUT = """PING 10.0.0.1 (10.0.0.1) 56(84) bytes of data.
+64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=0.512 ms
+64 bytes from 10.0.0.1: icmp_seq=3 ttl=64 time=0.733 ms
+
+--- 10.0.0.1 ping statistics ---
+4 packets transmitted, 2 received, 50% packet loss, time 3004ms
+rtt min/avg/max/mdev = 0.512/0.622/0.733/0.110 ms
+"""
+
+WINDOWS_OUTPUT = """Pinging 10.0.0.1 with 32 bytes of data:
+Reply from 10.0.0.1: bytes=32 time=3ms TTL=128
+Request timed out.
+Reply from 10.0.0.1: bytes=32 time=5ms TTL=128
+Reply from 10.0.0.1: bytes=32 time=4ms TTL=128
+
+Ping statistics for 10.0.0.1:
+    Packets: Sent = 4, Received = 3, Lost = 1 (25% loss),
+Approximate round trip times in milli-seconds:
+    Minimum = 3ms, Maximum = 5ms, Average = 4ms
+"""
+
+
+def test_summarize_loss_and_mdev():
+    stats = summarize(4, [10.0, 20.0, 30.0])
+    assert (stats["sent"], stats["received"], stats["loss"]) == (4, 3, 25.0)
+    assert (stats["rtt_min"], stats["rtt_avg"], stats["rtt_max"]) == (10.0, 20.0, 30.0)
+    # mdev of 10/20/30 is sqrt(200/3)
+    assert stats["jitter"] == pytest.approx(8.16, abs=0.01)
+
+    assert summarize(3, [5.0, 5.0, 5.0])["jitter"] == 0.0
+    assert summarize(3, [1.0])["loss"] == 66.7
+
+
+def test_summarize_without_replies():
+    stats = summarize(3, [])
+    assert stats["loss"] == 100.0
+    assert stats["received"] == 0
+    assert stats["rtt_avg"] is None and stats["jitter"] is None
+    assert summarize(0, [])["loss"] == 100.0
+
+
+def test_parse_linux_summary():
+    stats = parse_ping_summary(LINUX_OUTPUT, 4)
+    assert (stats["loss"], stats["received"]) == (50.0, 2)
+    assert (stats["rtt_min"], stats["rtt_avg"], stats["rtt_max"], stats["jitter"]) == (0.512, 0.622, 0.733, 0.110)
+
+
+def test_parse_windows_summary():
+    stats = parse_ping_summary(WINDOWS_OUTPUT, 4)
+    assert (stats["loss"], stats["received"]) == (25.0, 3)
+    assert (stats["rtt_min"], stats["rtt_avg"], stats["rtt_max"]) == (3.0, 4.0, 5.0)
+    # Windows prints no deviation
+    assert stats["jitter"] is None
+
+
+def test_parse_unreachable_summary():
+    output = "--- 10.0.0.9 ping statistics ---\n3 packets transmitted, 0 received, 100% packet loss, time 2040ms\n"
+    stats = parse_ping_summary(output, 3)
+    assert (stats["loss"], stats["received"], stats["rtt_avg"]) == (100.0, 0, None)
@@ -0,0 +1,113 @@
+# tests/test_device_inventory.py
+from inventory.device_inventory import DeviceInventory, write_snapshot
+from utils.cli import apply_overrides, parse_args
+
+DEVICES = [
+    {"ip": "10.0.0.1", "mac": "AA:BB:CC:DD:EE:01", "vendor": "Siemens AG", "hostname": "plc-1",
+     "status": "Reachable", "latency": 1.2, "open_ports": [102]},
+    {"ip": "10.0.0.2", "mac": "aa:bb:cc:dd:ee:02", "vendor": "Dell Inc.", "hostname": "ws-2",
+     "status": "Unreachable", "latency": None, "open_ports": []},
+]
+
+
+def test_load_latest_seeds_from_snapshot(tmp_path):
+    snapshot = tmp_path / "latest_results.json"
+    write_snapshot(DEVICES, path=str(snapshot))
+
+    inventory = DeviceInventory()
+    assert inventory.load_latest(manifest_file=str(tmp_path / "manifest.json"), snapshot_file=str(snapshot))
+    assert inventory.get("10.0.0.1")["hostname"] == "plc-1"
+    assert inventory.query(mac="aa-bb-cc-dd-ee-01")["total"] == 1
+
+
+def test_snapshot_reload_replaces_devices(tmp_path):
+    snapshot = str(tmp_path / "latest_results.json")
+    inventory = DeviceInventory()
+    write_snapshot(DEVICES, path=snapshot)
+    inventory.load_snapshot(snapshot)
+
+    write_snapshot(DEVICES[:1], path=snapshot)
+    assert inventory.load_snapshot(snapshot)
+    assert inventory.get("10.0.0.2") is None
+    assert inventory.stats()["devices"] == 1
+
+
+def test_missing_snapshot_and_manifest(tmp_path):
+    inventory = DeviceInventory()
+    assert not inventory.load_latest(manifest_file=str(tmp_path / "manifest.json"),
+                                     snapshot_file=str(tmp_path / "missing.json"))
+
+
+def test_query_ip_filter_does_not_override_scan_range():
+    args = parse_args(['--ip', '10.9.9.9', 'inventory', 'query', '--ip', '10.0.0.1'])
+    assert args.filter_ip == '10.0.0.1'
+    assert apply_overrides({}, args)['ip_range'] == '10.9.9.9/32'
+
+    args = parse_args(['inventory', 'query', '--ip', '10.0.0.1'])
+    assert 'ip_range' not in apply_overrides({}, args)
+
+
+def _fleet():
+    devices = [dict(d) for d in DEVICES]
+    devices.append({"ip": "10.0.0.10", "mac": "aa:bb:cc:dd:ee:10", "vendor": "Siemens AG", "hostname": "plc-10",
+                    "status": "Reachable", "latency": 2.0, "open_ports": [102, 80]})
+    devices.append({"ip": "10.0.0.3", "mac": "aa:bb:cc:dd:ee:03", "vendor": "Siemens AG", "hostname": "PLC-3",
+                    "status": "Unreachable", "latency": None, "open_ports": [102]})
+    inventory = DeviceInventory()
+    inventory.update(devices)
+    return inventory
+
+
+def _ips(page):
+    return [d["ip"] for d in page["items"]]
+
+
+def test_query_by_indexed_fields():
+    inventory = _fleet()
+    assert _ips(inventory.query(mac="AA-BB-CC-DD-EE-02")) == ["10.0.0.2"]
+    assert _ips(inventory.query(vendor="siemens ag")) == ["10.0.0.1", "10.0.0.3", "10.0.0.10"]
+    assert _ips(inventory.query(hostname="plc-3")) == ["10.0.0.3"]
+    assert _ips(inventory.query(ports=[80])) == ["10.0.0.10"]
+    assert inventory.query(vendor="Cisco")["total"] == 0
+    assert inventory.query(ports=[22])["total"] == 0
+
+
+def test_query_intersects_filters():
+    inventory = _fleet()
+    assert _ips(inventory.query(vendor="Siemens AG", status="Reachable")) == ["10.0.0.1", "10.0.0.10"]
+    assert _ips(inventory.query(vendor="Siemens AG", ports=[102, 80])) == ["10.0.0.10"]
+    assert _ips(inventory.query(ip="10.0.0.1", status="Unreachable")) == []
+
+
+def test_query_paginates_in_ip_order():
+    inventory = _fleet()
+    first = inventory.query(offset=0, limit=3)
+    second = inventory.query(offset=3, limit=3)
+    assert first["total"] == second["total"] == 4
+    assert _ips(first) == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    assert _ips(second) == ["10.0.0.10"]
+    assert inventory.query(offset=10)["items"] == []
+
+
+def test_update_counts_and_reindexes():
+    inventory = _fleet()
+    moved = dict(DEVICES[0], hostname="plc-1b", open_ports=[102, 443])
+    counts = inventory.update([moved, dict(DEVICES[1]), {"ip": "10.0.0.4", "status": "Reachable"}])
+    assert counts == {"added": 1, "changed": 1, "removed": 0}
+    assert inventory.query(hostname="plc-1")["total"] == 0
+    assert _ips(inventory.query(hostname="plc-1b")) == ["10.0.0.1"]
+    assert _ips(inventory.query(ports=[443])) == ["10.0.0.1"]
+
+    counts = inventory.update([moved, {"ip": "10.0.0.4", "status": "Reachable"}], replace=True)
+    assert counts == {"added": 0, "changed": 0, "removed": 3}
+    assert inventory.query(vendor="Siemens AG")["total"] == 1
+    assert inventory.query(ports=[80])["total"] == 0
+    assert inventory.stats()["devices"] == 2
+
+
+def test_duplicate_ip_in_one_update_keeps_last():
+    inventory = DeviceInventory()
+    counts = inventory.update([dict(DEVICES[0]), dict(DEVICES[0], hostname="plc-1b")])
+    assert counts["added"] == 1
+    assert inventory.get("10.0.0.1")["hostname"] == "plc-1b"
+    assert inventory.query(hostname="plc-1")["total"] == 0
@@ -0,0 +1,162 @@
+# tests/test_distributed.py
+import socket
+import time
+import zlib
+import pytest
+
+from distributed.agent import ScanAgent
+from distributed.collector import ScanCollector
+from distributed.frames import (HEADER, MAGIC, FrameError, decode_frame, encode_frame, sign_frame,
+                                verify_frame)
+from inventory.device_inventory import DeviceInventory
+
+SECRET = "test-secret"
+DEVICES = [
+    {"ip": "10.1.0.1", "mac": "aa:bb:cc:00:00:01", "vendor": "X", "hostname": "a", "status": "Reachable",
+     "latency": 1.0, "open_ports": [22]},
+    {"ip": "10.1.0.2", "mac": "aa:bb:cc:00:00:02", "vendor": "X", "hostname": "b", "status": "Reachable",
+     "latency": 2.0, "open_ports": []},
+    {"ip": "10.1.0.3", "mac": "aa:bb:cc:00:00:03", "vendor": "X", "hostname": "c", "status": "Reachable",
+     "latency": 3.0, "open_ports": []},
+]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _agent(tmp_path, port, site="plant-a", secret=SECRET):
+    return ScanAgent({"agent": {"site": site, "collector_host": "127.0.0.1", "collector_port": port,
+                                "batch_size": 2, "secret": secret, "timeout_seconds": 2,
+                                "spool_dir": str(tmp_path / f"spool-{site}")}})
+
+
+@pytest.fixture
+def collector():
+    collector = ScanCollector({"collector": {"host": "127.0.0.1", "port": 0, "secret": SECRET,
+                                             "flush_interval_seconds": 60}})
+    collector.start()
+    yield collector
+    collector.stop()
+
+
+def test_frame_round_trip():
+    payload = {"site": "a", "results": DEVICES}
+    assert decode_frame(encode_frame(payload)) == payload
+
+
+def test_decompression_bomb_is_rejected():
+    body = zlib.compress(b'[' + b' ' * 2_000_000 + b']', 9)
+    frame = HEADER.pack(MAGIC, len(body)) + body
+    with pytest.raises(FrameError):
+        decode_frame(frame, limit=1_000_000)
+    assert decode_frame(frame, limit=4_000_000) == []
+
+
+def test_hmac_signature():
+    signed = sign_frame({"site": "a", "seq": 0}, SECRET)
+    verify_frame(signed, SECRET)
+    with pytest.raises(FrameError):
+        verify_frame(dict(signed, site="b"), SECRET)
+    with pytest.raises(FrameError):
+        verify_frame(signed, "other-secret")
+    with pytest.raises(FrameError):
+        verify_frame({"site": "a", "seq": 0}, SECRET)
+
+
+def test_agent_delivers_spooled_frames(tmp_path, collector):
+    agent = _agent(tmp_path, collector.server.server_address[1])
+    agent.spool(DEVICES)
+    assert len(agent.pending()) == 2
+
+    assert agent.flush() == 2
+    assert agent.pending() == []
+    merged = collector.merged_results()
+    assert [d["ip"] for d in merged] == [d["ip"] for d in DEVICES]
+    assert all(d["site"] == "plant-a" for d in merged)
+
+
+def test_spool_survives_collector_outage(tmp_path):
+    port = _free_port()
+    agent = _agent(tmp_path, port)
+    agent.spool(DEVICES)
+    assert agent.flush() == 0
+    assert len(agent.pending()) == 2
+
+    collector = ScanCollector({"collector": {"host": "127.0.0.1", "port": port, "secret": SECRET}})
+    collector.start()
+    try:
+        assert agent.flush() == 2
+        assert len(collector.merged_results()) == len(DEVICES)
+    finally:
+        collector.stop()
+
+
+def test_unsigned_frames_are_rejected(tmp_path, collector):
+    agent = _agent(tmp_path, collector.server.server_address[1], secret="wrong-secret")
+    agent.spool(DEVICES)
+    assert agent.flush() == 0
+    # Rejections are permanent: the frames are set aside instead of blocking the spool
+    assert agent.pending() == []
+    assert len(agent.rejected()) == 2
+    assert collector.merged_results() == []
+
+
+def test_good_frames_are_delivered_after_a_rejected_one(tmp_path, collector):
+    port = collector.server.server_address[1]
+    _agent(tmp_path, port, secret="wrong-secret").spool(DEVICES[:1])
+    agent = _agent(tmp_path, port)
+    agent.spool(DEVICES)
+    assert len(agent.pending()) == 3
+
+    assert agent.flush() == 2
+    assert agent.pending() == []
+    assert len(agent.rejected()) == 1
+    assert [d["ip"] for d in collector.merged_results()] == [d["ip"] for d in DEVICES]
+
+
+def test_site_that_never_completes_a_cycle_goes_stale(tmp_path, collector):
+    agent = _agent(tmp_path, collector.server.server_address[1], site="plant-c", secret="wrong-secret")
+    agent.spool(DEVICES)
+    agent.flush()
+
+    assert collector.stale_sites() == []
+    collector.sites["plant-c"].first_seen = time.time() - 3 * collector.flush_interval
+    assert collector.stale_sites() == ["plant-c"]
+
+
+def test_stale_site_is_reported_unreachable(tmp_path, collector):
+    for site in ("plant-a", "plant-b"):
+        agent = _agent(tmp_path, collector.server.server_address[1], site=site)
+        agent.spool(DEVICES[:1])
+        agent.flush()
+
+    collector.sites["plant-b"].completed_at = time.time() - 3 * collector.flush_interval
+    assert collector.stale_sites() == ["plant-b"]
+    by_site = {d["site"]: d for d in collector.merged_results()}
+    assert by_site["plant-a"]["status"] == "Reachable"
+    assert by_site["plant-b"]["status"] == "Unreachable"
+    assert by_site["plant-b"]["site_stale"]
+
+
+def test_public_bind_requires_secret():
+    collector = ScanCollector({"collector": {"host": "0.0.0.0", "port": 0}})
+    with pytest.raises(RuntimeError):
+        collector.start()
+    assert ScanCollector({}).address[0] == "127.0.0.1"
+
+
+def test_same_ip_at_two_sites_stays_two_inventory_records(tmp_path, collector):
+    for site, hostname in (("plant-a", "press"), ("plant-b", "lathe")):
+        agent = _agent(tmp_path, collector.server.server_address[1], site=site)
+        agent.spool([dict(DEVICES[0], hostname=hostname)])
+        agent.flush()
+
+    inventory = DeviceInventory()
+    assert inventory.update(collector.merged_results(), replace=True)["added"] == 2
+    found = inventory.query(ip="10.1.0.1")
+    assert [(d["site"], d["hostname"]) for d in found["items"]] == [("plant-a", "press"), ("plant-b", "lathe")]
+    assert inventory.get("10.1.0.1", site="plant-b")["hostname"] == "lathe"
+    assert inventory.query(site="plant-a")["total"] == 1
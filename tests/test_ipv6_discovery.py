@@ -0,0 +1,75 @@
+# tests/test_ipv6_discovery.py
+import threading
+import time
+import pytest
+
+pytest.importorskip("netifaces")
+from scanner.ipv6_discovery import _REPLY_RE, mac_from_eui64, merge_ipv6, preferred_address
+
+
+class StubScanner:
+    scan_workers = 8
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def _probe(self):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.1)
+        with self.lock:
+            self.active -= 1
+
+    def get_hostname(self, ip):
+        self._probe()
+        return "host"
+
+    def check_ports(self, ip):
+        self._probe()
+        return [22]
+
+    def lookup_mac_vendor(self, mac):
+        return "Vendor"
+
+
+def test_reply_regex_matches_linux_and_macos_ping6():
+    output = "\n".join([
+        "64 bytes from fe80::1%eth0: icmp_seq=1 ttl=64 time=0.41 ms",
+        "64 bytes from 2001:db8::5: icmp_seq=1 ttl=64 time=1.2 ms",
+        "16 bytes from fe80::aabb:ccff:fedd:eeff%en0, icmp_seq=0 hlim=64 time=0.532 ms",
+        "16 bytes from 2001:db8::7, icmp_seq=0 hlim=64 time=3.1 ms",
+    ])
+    assert [m.groups() for m in _REPLY_RE.finditer(output)] == [
+        ("fe80::1", "0.41"), ("2001:db8::5", "1.2"),
+        ("fe80::aabb:ccff:fedd:eeff", "0.532"), ("2001:db8::7", "3.1"),
+    ]
+
+
+def test_mac_from_eui64():
+    assert mac_from_eui64("fe80::211:22ff:fe33:4455") == "00:11:22:33:44:55"
+    assert mac_from_eui64("2001:db8::1") is None
+
+
+def test_preferred_address_order():
+    assert preferred_address(["fe80::1%eth0", "fd00::1", "2001:db8::1"]) == ["2001:db8::1", "fd00::1", "fe80::1%eth0"]
+
+
+def test_merge_ipv6_attaches_and_enriches_concurrently():
+    results = [{"ip": "10.0.0.1", "mac": "aa:bb:cc:dd:ee:01"}]
+    hosts = {
+        "aa:bb:cc:dd:ee:01": {"2001:db8::1"},
+        None: {f"2001:db8::{i}" for i in range(2, 8)},
+    }
+    active = {f"2001:db8::{i}" for i in range(2, 8)}
+    scanner = StubScanner()
+
+    merge_ipv6(results, hosts, {"2001:db8::2": 1.5}, active, scanner)
+
+    assert results[0]["ipv6"] == ["2001:db8::1"]
+    added = {d["ip"]: d for d in results[1:]}
+    assert set(added) == active
+    assert added["2001:db8::2"]["latency"] == 1.5
+    assert scanner.peak > 1
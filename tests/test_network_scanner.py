@@ -0,0 +1,50 @@
+# tests/test_network_scanner.py
+import time
+import pytest
+
+pytest.importorskip("netifaces")
+from scanner import network_scanner
+from scanner.network_scanner import NetworkScanner
+from scanner.passive_listener import PassiveTable
+
+
+@pytest.fixture
+def scanner(tmp_path, monkeypatch):
+    scanner = NetworkScanner({"ip_range": "10.0.0.0/30", "passive": {"enabled": True}})
+    scanner.passive_table = PassiveTable(path=str(tmp_path / "passive_table.json"))
+    monkeypatch.setattr(scanner, "ping_device", lambda ip: ("Reachable", 1.0))
+    monkeypatch.setattr(scanner, "check_ports", lambda ip: [])
+
+    def no_probes(*args, **kwargs):
+        raise AssertionError("passively seen hosts must not be probed")
+    monkeypatch.setattr(network_scanner.subprocess, "check_output", no_probes)
+    return scanner
+
+
+def _observe(scanner, ip, hostname=None):
+    scanner.passive_table.observe({"ip": ip, "mac": "aa:bb:cc:dd:ee:01", "hostname": hostname, "source": "arp"},
+                                  seen_at=time.time())
+
+
+def test_passive_host_uses_announced_name(scanner, monkeypatch):
+    monkeypatch.setattr(network_scanner.socket, "gethostbyaddr", lambda ip: pytest.fail("unexpected DNS lookup"))
+    _observe(scanner, "10.0.0.1", hostname="plc-1")
+    device = scanner.scan_ip("10.0.0.1")
+    assert device["hostname"] == "plc-1"
+    assert device["discovery"] == "passive"
+
+
+def test_passive_host_without_name_falls_back_to_reverse_dns(scanner, monkeypatch):
+    monkeypatch.setattr(network_scanner.socket, "gethostbyaddr", lambda ip: ("ws-2.example.lan", [], [ip]))
+    _observe(scanner, "10.0.0.2")
+    device = scanner.scan_ip("10.0.0.2")
+    assert device["hostname"] == "ws-2.example.lan"
+    assert device["mac"] == "aa:bb:cc:dd:ee:01"
+
+
+def test_passive_host_without_dns_name_stays_unknown(scanner, monkeypatch):
+    def nxdomain(ip):
+        raise OSError("host not found")
+    monkeypatch.setattr(network_scanner.socket, "gethostbyaddr", nxdomain)
+    _observe(scanner, "10.0.0.2")
+    assert scanner.scan_ip("10.0.0.2")["hostname"] == "Unknown"
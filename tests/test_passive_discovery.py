@@ -0,0 +1,85 @@
+# tests/test_passive_discovery.py
+import time
+
+from scanner.packet_parsers import parse_frame
+from scanner.passive_listener import PassiveListener, PassiveTable, ingest_pcap
+from scanner.pcap_reader import read_pcap, write_pcap
+from tests.pcap_frames import (FIXTURE, BASE_TIME, arp, dhcp_request, ethernet, fixture_frames,
+                               mdns_announcement, nbns_registration)
+
+
+def test_fixture_matches_builders():
+    assert [frame for _, frame in read_pcap(FIXTURE)] == [frame for _, frame in fixture_frames()]
+
+
+def test_parse_arp():
+    assert parse_frame(arp('00:1b:1b:00:00:01', '10.0.0.10', '10.0.0.1')) == [
+        {"ip": "10.0.0.10", "mac": "00:1b:1b:00:00:01", "hostname": None, "source": "arp"}]
+
+
+def test_parse_arp_probe_is_ignored():
+    assert parse_frame(arp('00:00:00:00:00:00', '0.0.0.0', '10.0.0.50')) == []
+
+
+def test_parse_arp_behind_vlan_tag():
+    frame = arp('00:1b:1b:00:00:01', '10.0.0.10', '10.0.0.1')
+    tagged = ethernet('00:1b:1b:00:00:01', 0x0806, frame[14:], vlan=20)
+    assert parse_frame(tagged)[0]["ip"] == "10.0.0.10"
+
+
+def test_parse_dhcp_request():
+    assert parse_frame(dhcp_request('00:1b:1b:00:00:02', '10.0.0.20', 'plc-line2')) == [
+        {"ip": "10.0.0.20", "mac": "00:1b:1b:00:00:02", "hostname": "plc-line2", "source": "dhcp"}]
+
+
+def test_parse_mdns_announcement():
+    assert parse_frame(mdns_announcement('3c:22:fb:00:00:03', '10.0.0.30', 'printer-3')) == [
+        {"ip": "10.0.0.30", "mac": "3c:22:fb:00:00:03", "hostname": "printer-3", "source": "mdns"}]
+
+
+def test_parse_nbns_registration():
+    assert parse_frame(nbns_registration('00:15:5d:00:00:04', '10.0.0.40', 'WS-ACCOUNTS')) == [
+        {"ip": "10.0.0.40", "mac": "00:15:5d:00:00:04", "hostname": "WS-ACCOUNTS", "source": "nbns"}]
+
+
+def test_truncated_frames_yield_nothing():
+    frame = mdns_announcement('3c:22:fb:00:00:03', '10.0.0.30', 'printer-3')
+    for cut in (10, 20, 40, len(frame) - 3):
+        assert parse_frame(frame[:cut]) == []
+
+
+def test_ingest_pcap_fixture(tmp_path):
+    table = PassiveTable(path=str(tmp_path / "passive_table.json"))
+    assert ingest_pcap(FIXTURE, table) == 4
+    assert set(table.entries) == {"10.0.0.10", "10.0.0.20", "10.0.0.30", "10.0.0.40"}
+    assert table.entries["10.0.0.40"]["hostname"] == "WS-ACCOUNTS"
+    assert table.entries["10.0.0.20"]["last_seen"] == BASE_TIME + 1
+
+    assert table.recent("10.0.0.10", 60, now=BASE_TIME + 30)
+    assert table.recent("10.0.0.10", 60, now=BASE_TIME + 120) is None
+
+
+def test_pcap_round_trip(tmp_path):
+    path = str(tmp_path / "roundtrip.pcap")
+    frames = fixture_frames()
+    write_pcap(path, frames)
+    assert [(round(ts, 6), frame) for ts, frame in read_pcap(path)] == frames
+
+
+def test_save_prunes_hosts_not_seen_for_max_age(tmp_path):
+    path = str(tmp_path / "passive_table.json")
+    table = PassiveTable(path=path, max_age=3600)
+    now = time.time()
+    table.observe({"ip": "10.0.0.1", "mac": "aa:bb:cc:dd:ee:01", "source": "arp"}, seen_at=now - 60)
+    table.observe({"ip": "10.0.0.2", "mac": "aa:bb:cc:dd:ee:02", "source": "arp"}, seen_at=now - 7200)
+    table.save()
+
+    assert set(PassiveTable.load(path).entries) == {"10.0.0.1"}
+
+
+def test_listener_retains_at_least_the_skip_window(tmp_path):
+    table = PassiveTable(path=str(tmp_path / "passive_table.json"))
+    PassiveListener({"passive": {"retain_seconds": 60, "skip_window_seconds": 900}}, table=table)
+    assert table.max_age == 900
+    PassiveListener({"passive": {}}, table=table)
+    assert table.max_age == 86400
@@ -0,0 +1,54 @@
+# tests/test_quick_check.py
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold start of `main.py check`, interpreter startup included
+CHECK_BUDGET_SECONDS = 1.5
+
+HEAVY_MODULES = ['report.html_reporter', 'notifications.email_alert', 'netifaces', 'utils.logger']
+
+_PROBE = """
+import json, sys
+sys.argv = ['main.py', 'check', '127.0.0.1', '--ports', '1', '--quiet']
+import main
+code = main.main()
+print(json.dumps({"code": code, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def test_check_cold_start_within_budget(tmp_path):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'main.py'), 'check', '127.0.0.1', '--ports', '1', '--quiet'],
+        cwd=tmp_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=30
+    )
+    elapsed = time.perf_counter() - start
+
+    assert proc.returncode in (0, 1), proc.stderr
+    assert elapsed < CHECK_BUDGET_SECONDS, f"main.py check took {elapsed:.2f}s"
+    # No log file or report directory from a check
+    assert not os.listdir(tmp_path)
+
+
+def test_check_does_not_import_heavy_modules(tmp_path):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run([sys.executable, '-c', _PROBE], cwd=tmp_path, env=env,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert result["loaded"] == []
+
+
+def test_main_import_time():
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'], cwd=ROOT,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    # "import time: self [us] | cumulative | imported package"
+    cumulative = next(int(line.split('|')[1]) for line in proc.stderr.splitlines()
+                      if line.split('|')[-1].strip() == 'main')
+    assert cumulative < 250_000, f"importing main took {cumulative / 1000:.0f} ms"
@@ -0,0 +1,110 @@
+# tests/test_rate_limiter.py
+import pytest
+
+from scanner import rate_limiter
+from scanner.rate_limiter import ProbeRateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() advances monotonic() instantly."""
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def _limiter(**settings):
+    return ProbeRateLimiter({"rate_limit": dict({"enabled": True, "per_subnet_pps": 10000}, **settings)})
+
+
+def _elapsed(clock, probes):
+    start = clock.now
+    for call in probes:
+        call()
+    return clock.now - start
+
+
+def test_token_bucket_allows_burst_then_paces(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    assert _elapsed(clock, [bucket.acquire] * 5) == 0
+    assert _elapsed(clock, [bucket.acquire] * 10) == pytest.approx(1.0)
+
+
+def test_token_bucket_refills_up_to_burst(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    _elapsed(clock, [bucket.acquire] * 5)
+    clock.sleep(60)
+    assert _elapsed(clock, [bucket.acquire] * 5) == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+
+
+def test_set_rate_changes_pace(clock):
+    bucket = TokenBucket(rate=10, burst=1)
+    bucket.acquire()
+    bucket.set_rate(100)
+    assert _elapsed(clock, [bucket.acquire] * 10) == pytest.approx(0.1)
+
+
+def test_global_limit_paces_across_hosts(clock):
+    limiter = _limiter(pps=100, burst=1)
+    probes = [lambda ip=f"10.0.{i // 250}.{i % 250 + 1}": limiter.acquire(ip) for i in range(201)]
+    assert _elapsed(clock, probes) == pytest.approx(2.0)
+
+
+def test_per_host_limit(clock):
+    limiter = _limiter(pps=1000, burst=1000, per_host_pps=10)
+    # One second of burst, then ten per second to the same host
+    assert _elapsed(clock, [lambda: limiter.acquire("10.0.0.1")] * 30) == pytest.approx(2.0)
+    # Other hosts are not held back by it
+    assert _elapsed(clock, [lambda: limiter.acquire("10.0.0.2")] * 10) == 0
+
+
+def test_per_subnet_limit(clock):
+    limiter = _limiter(pps=1000, burst=1000, per_host_pps=1000, per_subnet_pps=50, subnet_prefix=24)
+    assert _elapsed(clock, [lambda i=i: limiter.acquire(f"10.0.0.{i}") for i in range(1, 101)]) == pytest.approx(1.0)
+    assert _elapsed(clock, [lambda: limiter.acquire("10.0.1.1")]) == 0
+
+
+def _window(limiter, failures, size=10):
+    for i in range(size):
+        limiter.record(i >= failures)
+    return limiter.global_bucket.rate
+
+
+def test_record_halves_on_loss_down_to_min_pps(clock):
+    limiter = _limiter(pps=200, min_pps=20, window=10)
+    assert [_window(limiter, failures=5) for _ in range(5)] == [100, 50, 25, 20, 20]
+
+
+def test_record_grows_additively_up_to_pps(clock):
+    limiter = _limiter(pps=200, min_pps=20, increase_pps=10, window=10)
+    limiter.global_bucket.set_rate(180)
+    assert [_window(limiter, failures=0) for _ in range(3)] == [190, 200, 200]
+
+
+def test_record_holds_rate_between_thresholds(clock):
+    limiter = _limiter(pps=200, window=10, loss_high=0.2, loss_low=0.05)
+    assert _window(limiter, failures=1) == 200
+    assert _window(limiter, failures=2) == 200
+    # A partial window changes nothing
+    for _ in range(9):
+        limiter.record(False)
+    assert limiter.global_bucket.rate == 200
+    limiter.record(False)
+    assert limiter.global_bucket.rate == 100
+
+
+def test_record_ignored_without_adaptive(clock):
+    limiter = _limiter(adaptive=False, window=10)
+    assert _window(limiter, failures=10) == 200
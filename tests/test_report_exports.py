@@ -0,0 +1,131 @@
+# tests/test_report_exports.py
+from datetime import datetime
+import pytest
+
+import report.columnar_reporter as columnar_module
+import report.jsonl_reporter as jsonl_module
+from report.columnar_reporter import ColumnarReporter
+from report.jsonl_reporter import JSONLReporter
+from report.schema import SCAN_COLUMNS
+
+# Layout before user-032/033 added ipv6, loss, jitter, rtt_min, rtt_max (and services)
+OLD_COLUMNS = [(name, col_type) for name, col_type in SCAN_COLUMNS
+               if name not in ("ipv6", "loss", "jitter", "rtt_min", "rtt_max", "services")]
+
+DAY1 = [
+    {"ip": "10.0.0.1", "mac": "aa:bb:cc:dd:ee:01", "vendor": "Siemens AG", "hostname": "plc-1",
+     "status": "Reachable", "latency": 1.25, "open_ports": [102, 502]},
+    {"ip": "10.0.0.2", "mac": "Unknown", "vendor": "", "hostname": None,
+     "status": "Unreachable", "latency": None, "open_ports": []},
+]
+DAY2 = [
+    {"ip": "10.0.0.1", "mac": "aa:bb:cc:dd:ee:01", "vendor": "Siemens AG", "hostname": "plc-1",
+     "status": "Reachable", "latency": 0.5, "loss": 0.0, "jitter": 0.1, "rtt_min": 0.4, "rtt_max": 0.7,
+     "open_ports": [22], "ipv6": ["fe80::1%eth0", ""],
+     "services": [{"port": 22, "service": "ssh", "product": "OpenSSH_9.6"}]},
+    {"ip": "10.0.0.3", "mac": "aa:bb:cc:dd:ee:03", "vendor": "Dell Inc.", "hostname": "",
+     "status": "Reachable", "latency": 3.0, "loss": 33.3, "jitter": None, "rtt_min": None, "rtt_max": None,
+     "open_ports": [], "ipv6": []},
+]
+DAY3 = [
+    {"ip": "10.0.0.4", "mac": "aa:bb:cc:dd:ee:04", "vendor": "HP", "hostname": "printer",
+     "status": "Reachable", "latency": 2.0, "open_ports": [9100]},
+]
+DAYS = [("2026-10-01", DAY1), ("2026-10-02", DAY2), ("2026-10-03", DAY3)]
+
+
+def _at(monkeypatch, module, day):
+    fixed = datetime.strptime(f"{day} 12:00:00", "%Y-%m-%d %H:%M:%S")
+
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return fixed
+
+    monkeypatch.setattr(module, "datetime", FixedDatetime)
+    return fixed.timestamp()
+
+
+def _expected(devices, scan_time, old_schema=False):
+    rows = []
+    for d in devices:
+        row = {
+            "scan_time": int(scan_time), "ip": d["ip"], "mac": d["mac"], "vendor": d["vendor"],
+            "hostname": d["hostname"], "status": d["status"], "latency": d["latency"],
+            "loss": d.get("loss"), "jitter": d.get("jitter"), "rtt_min": d.get("rtt_min"),
+            "rtt_max": d.get("rtt_max"), "open_ports": d["open_ports"], "ipv6": d.get("ipv6", []),
+            "services": [f"{s['port']}/{s['service']} {s['product']}" for s in d.get("services", [])],
+        }
+        if old_schema:
+            row.update({name: None for name in ("ipv6", "loss", "jitter", "rtt_min", "rtt_max", "services")})
+        rows.append(row)
+    return rows
+
+
+@pytest.fixture
+def skyc_only(monkeypatch):
+    # Exercise the built-in layout even where pyarrow is installed
+    monkeypatch.setattr(columnar_module, "_pyarrow", lambda: None)
+
+
+def _rows(columns):
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def test_columnar_round_trip_across_partitions(tmp_path, monkeypatch, skyc_only):
+    root = str(tmp_path / "columnar")
+    expected = []
+    for day, devices in DAYS:
+        scan_time = _at(monkeypatch, columnar_module, day)
+        assert ColumnarReporter(root=root).generate(devices).endswith(".skyc")
+        expected += _expected(devices, scan_time)
+
+    assert _rows(ColumnarReporter.load(root=root)) == expected
+    # Partition pruning and column projection
+    loaded = ColumnarReporter.load(start="2026-10-02", end="2026-10-02", columns=["ip", "services"], root=root)
+    assert loaded == {"ip": ["10.0.0.1", "10.0.0.3"], "services": [["22/ssh OpenSSH_9.6"], []]}
+
+
+def test_columnar_mixes_old_and_new_schema(tmp_path, monkeypatch, skyc_only):
+    root = str(tmp_path / "columnar")
+    scan_time = _at(monkeypatch, columnar_module, "2026-10-01")
+    monkeypatch.setattr(columnar_module, "SCAN_COLUMNS", OLD_COLUMNS)
+    ColumnarReporter(root=root).generate(DAY1)
+    monkeypatch.setattr(columnar_module, "SCAN_COLUMNS", SCAN_COLUMNS)
+
+    new_time = _at(monkeypatch, columnar_module, "2026-10-02")
+    ColumnarReporter(root=root).generate(DAY2)
+
+    loaded = ColumnarReporter.load(root=root)
+    assert {len(values) for values in loaded.values()} == {4}
+    assert _rows(loaded) == _expected(DAY1, scan_time, old_schema=True) + _expected(DAY2, new_time)
+    # Only new columns requested: old files still contribute aligned rows
+    assert ColumnarReporter.load(columns=["ip", "jitter"], root=root)["jitter"] == [None, None, 0.1, None]
+
+
+def test_skyc_empty_scan(tmp_path, monkeypatch, skyc_only):
+    root = str(tmp_path / "columnar")
+    _at(monkeypatch, columnar_module, "2026-10-01")
+    ColumnarReporter(root=root).generate([])
+    assert ColumnarReporter.load(root=root) == {name: [] for name, _ in SCAN_COLUMNS}
+
+
+def test_jsonl_round_trip_across_partitions(tmp_path, monkeypatch):
+    root = str(tmp_path / "jsonl")
+    expected = []
+    for day, devices in DAYS:
+        scan_time = _at(monkeypatch, jsonl_module, day)
+        assert JSONLReporter(root=root).generate(devices).endswith(".jsonl.gz")
+        expected += _expected(devices, scan_time)
+
+    assert list(JSONLReporter.load(root=root)) == expected
+    assert [r["ip"] for r in JSONLReporter.load(start="2026-10-02", root=root)] == ["10.0.0.1", "10.0.0.3", "10.0.0.4"]
+    assert [r["ip"] for r in JSONLReporter.load(end="2026-10-01", root=root)] == ["10.0.0.1", "10.0.0.2"]
+
+
+def test_jsonl_zstd_falls_back_or_round_trips(tmp_path, monkeypatch):
+    root = str(tmp_path / "jsonl")
+    scan_time = _at(monkeypatch, jsonl_module, "2026-10-02")
+    JSONLReporter(compression="zstd", root=root).generate(DAY2)
+    assert list(JSONLReporter.load(root=root)) == _expected(DAY2, scan_time)
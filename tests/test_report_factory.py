@@ -0,0 +1,28 @@
+# tests/test_report_factory.py
+from report.fanout_reporter import FanoutReporter
+from report.report_factory import get_reporter, parse_formats
+
+
+def test_parse_formats_drops_unknown_and_duplicates():
+    assert parse_formats(["html", "htm", "HTML", "csv"]) == ["html", "csv"]
+    assert parse_formats("json, jsonl ,json") == ["json", "jsonl"]
+
+
+def test_parse_formats_falls_back_to_html():
+    assert parse_formats("htm") == ["html"]
+    assert parse_formats(None) == ["html"]
+
+
+def test_typo_does_not_render_html_twice():
+    reporter = get_reporter(["html", "htm"])
+    assert not isinstance(reporter, FanoutReporter)
+
+
+def test_fanout_writes_every_format():
+    results = [{"ip": "10.0.0.1", "mac": "aa:bb:cc:dd:ee:01", "vendor": "X", "hostname": "h",
+                "status": "Reachable", "latency": 1.0, "open_ports": [22]}]
+    reporter = get_reporter("csv,json", primary="json")
+    path = reporter.generate(results)
+    assert path.endswith(".json")
+    assert set(reporter.paths) == {"csv", "json"}
+    assert all(reporter.paths.values())
@@ -0,0 +1,149 @@
+# tests/test_retention_manager.py
+import gzip
+import os
+import time
+import pytest
+
+from utils.retention_manager import RetentionManager
+
+DAY = 86400
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("reports")
+    os.makedirs("logs")
+    return tmp_path
+
+
+def _write(path, size=100, age_days=0):
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    mtime = time.time() - age_days * DAY
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _add_run(manager, run_id, age_days, size=100, extras=()):
+    report = _write(f"reports/report_{run_id}.html", size)
+    log = _write(f"logs/scan_{run_id}.log", size)
+    extra_reports = [_write(f"reports/report_{run_id}.{ext}", size) for ext in extras]
+    manager.manifest["runs"][run_id] = {
+        "timestamp": time.time() - age_days * DAY, "report": report, "extra_reports": extra_reports,
+        "log": log, "total_devices": 0, "reachable": 0, "unreachable": 0,
+        "bytes": size * (2 + len(extra_reports)),
+    }
+    manager.manifest["latest"] = run_id
+    return [report, log] + extra_reports
+
+
+def _manager(**policy):
+    defaults = {"compress_after_days": 1000, "sweep_interval_hours": 1000}
+    manager = RetentionManager({"retention": dict(defaults, **policy)})
+    manager.manifest["last_sweep"] = time.time()
+    return manager
+
+
+def test_record_run_indexes_latest(workdir):
+    manager = _manager()
+    report = _write("reports/report_a.html")
+    extra = _write("reports/report_a.csv", 50)
+    log = _write("logs/scan_a.log", 10)
+    run_id = manager.record_run(report, log, [{"status": "Reachable"}, {"status": "Unreachable"}],
+                                extra_reports=[extra])
+
+    reloaded = RetentionManager()
+    entry = reloaded.latest_run()
+    assert reloaded.get_run(run_id) == entry
+    assert entry["extra_reports"] == [extra]
+    assert entry["bytes"] == 160
+    assert (entry["reachable"], entry["unreachable"]) == (1, 1)
+
+
+def test_age_policy_removes_old_runs_and_their_files(workdir):
+    manager = _manager(max_age_days=30)
+    old = _add_run(manager, "old", age_days=40, extras=("csv", "json"))
+    new = _add_run(manager, "new", age_days=1)
+
+    assert manager.enforce() == 1
+    assert [rid for rid, _ in manager.runs()] == ["new"]
+    assert not any(os.path.exists(p) for p in old)
+    assert all(os.path.exists(p) for p in new)
+
+
+def test_latest_run_survives_every_policy(workdir):
+    manager = _manager(max_age_days=30, max_runs=1, max_size_mb=0)
+    _add_run(manager, "a", age_days=60)
+    latest = _add_run(manager, "b", age_days=60)
+
+    manager.enforce()
+    assert [rid for rid, _ in manager.runs()] == ["b"]
+    assert manager.manifest["latest"] == "b"
+    assert all(os.path.exists(p) for p in latest)
+
+
+def test_count_policy_keeps_newest(workdir):
+    manager = _manager(max_runs=2)
+    for i in range(5):
+        _add_run(manager, f"run{i}", age_days=5 - i)
+
+    assert manager.enforce() == 3
+    assert [rid for rid, _ in manager.runs()] == ["run3", "run4"]
+    assert not os.path.exists("reports/report_run0.html")
+
+
+def test_size_policy_deletes_oldest_first(workdir):
+    manager = _manager(max_size_mb=1)
+    for i in range(4):
+        _add_run(manager, f"run{i}", age_days=4 - i, size=300 * 1024)   # 600 KB per run
+
+    manager.enforce()
+    assert [rid for rid, _ in manager.runs()] == ["run3"]
+    assert manager.manifest["latest"] == "run3"
+
+
+def test_compression_updates_paths_and_bytes(workdir):
+    manager = _manager(compress_after_days=1)
+    _add_run(manager, "old", age_days=2, size=10000, extras=("csv", "parquet"))
+    _add_run(manager, "new", age_days=0, size=10000)
+
+    manager.enforce()
+    old = manager.get_run("old")
+    assert old["report"] == "reports/report_old.html.gz"
+    assert old["log"] == "logs/scan_old.log.gz"
+    # Already-compressed formats are left alone
+    assert old["extra_reports"] == ["reports/report_old.csv.gz", "reports/report_old.parquet"]
+    assert not os.path.exists("reports/report_old.html")
+    with gzip.open(old["report"], "rb") as f:
+        assert f.read() == b"x" * 10000
+    assert old["bytes"] == sum(os.path.getsize(p) for p in [old["report"], old["log"]] + old["extra_reports"])
+    assert old["bytes"] < 30000
+    assert manager.get_run("new")["report"] == "reports/report_new.html"
+
+    # The manifest on disk has the new paths
+    assert RetentionManager().get_run("old")["report"] == "reports/report_old.html.gz"
+
+
+def test_sweep_removes_only_old_untracked_files(workdir):
+    manager = _manager(max_age_days=30, sweep_interval_hours=24)
+    manager.manifest["last_sweep"] = 0
+    tracked = _add_run(manager, "kept", age_days=1)
+    for path in tracked:
+        os.utime(path, (time.time() - 90 * DAY,) * 2)   # tracked files are never swept, whatever their age
+    stray_old = _write("logs/scan_module.log", age_days=60)
+    stray_new = _write("logs/scan_recent.log", age_days=1)
+    protected = [_write(f"reports/{name}", age_days=60)
+                 for name in ("weekly_summary.json", "latest_results.json", "temp.file")]
+
+    manager.enforce()
+    assert not os.path.exists(stray_old)
+    assert os.path.exists(stray_new)
+    assert all(os.path.exists(p) for p in protected + tracked)
+    assert os.path.exists("reports/manifest.json")
+    assert manager.manifest["last_sweep"] > 0
+
+
+def test_corrupt_manifest_starts_fresh(workdir):
+    _write("reports/manifest.json")
+    assert RetentionManager().runs() == []
@@ -0,0 +1,73 @@
+# tests/test_scan_journal.py
+import json
+import time
+
+from scanner.scan_journal import ScanJournal, to_ranges
+
+SUBNET, PORTS = "10.0.0.0/22", [22, 80]
+
+
+def _interrupted_journal(path, count=10, flush_every=4):
+    journal = ScanJournal(path=path, flush_every=flush_every)
+    journal.open(SUBNET, PORTS)
+    for i in range(count):
+        journal.mark_done(i, {"ip": f"10.0.0.{i}"} if i % 2 else None)
+    journal.file.close()   # crash: the unflushed tail is lost
+    return journal
+
+
+def test_to_ranges():
+    assert to_ranges([7, 0, 1, 2, 5, 8]) == [[0, 2], [5, 5], [7, 8]]
+
+
+def test_resume_restores_flushed_progress(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    _interrupted_journal(path)
+
+    journal = ScanJournal(path=path)
+    assert journal.resumable(SUBNET, PORTS)
+    done, results = journal.load(SUBNET, PORTS)
+    assert done == set(range(8))
+    assert [d["ip"] for d in results] == ["10.0.0.1", "10.0.0.3", "10.0.0.5", "10.0.0.7"]
+
+
+def test_torn_tail_is_ignored_and_trimmed(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    _interrupted_journal(str(path))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "progress", "done": [[8,')
+
+    journal = ScanJournal(path=str(path), flush_every=1)
+    done, _ = journal.load(SUBNET, PORTS)
+    assert done == set(range(8))
+    journal.open(SUBNET, PORTS, resume=True)
+    journal.mark_done(8)
+    journal.close()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines[-1]["done"] == [[8, 8]]
+
+
+def test_mismatched_or_stale_journal_is_discarded(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    _interrupted_journal(path)
+    assert not ScanJournal(path=path).resumable("10.0.4.0/22", PORTS)
+    assert ScanJournal(path=path).load(SUBNET, [22]) is None
+    assert not (tmp_path / "journal.jsonl").exists()
+
+    _interrupted_journal(path)
+    stale = ScanJournal(path=path, stale_after_hours=1)
+    header = json.loads(open(path).readline())
+    header["started_at"] = time.time() - 7200
+    lines = open(path).read().splitlines()
+    with open(path, "w") as f:
+        f.write("\n".join([json.dumps(header)] + lines[1:]) + "\n")
+    assert not stale.resumable(SUBNET, PORTS)
+
+
+def test_completed_scan_removes_journal(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = ScanJournal(path=str(path))
+    journal.open(SUBNET, PORTS)
+    journal.mark_done(0)
+    journal.close(completed=True)
+    assert not path.exists()
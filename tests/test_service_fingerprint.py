@@ -0,0 +1,174 @@
+# tests/test_service_fingerprint.py
+import socket
+import threading
+import time
+import pytest
+
+from report.schema import matched_services, service_label
+from scanner.service_fingerprint import FingerprintCache, ServiceFingerprinter
+
+# X.224 Connection Confirm with an RDP Negotiation Response selecting CredSSP (NLA)
+RDP_CONFIRM = bytes.fromhex("03000013" "0ed000001234" "00" "0200080002000000")
+
+
+class LocalServer:
+    """Accepts connections on 127.0.0.1 and hands each to handler; counts connections."""
+    def __init__(self, handler):
+        self.handler = handler
+        self.connections = 0
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(16)
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        with conn:
+            try:
+                self.handler(conn)
+            except OSError:
+                pass
+
+    def close(self):
+        self.sock.close()
+
+
+def ssh_server(conn):
+    conn.sendall(b"SSH-2.0-OpenSSH_8.9p1 Ubuntu-3ubuntu0.6\r\n")
+    time.sleep(0.2)
+
+
+def http_server(conn):
+    conn.recv(1024)
+    conn.sendall(b"HTTP/1.0 200 OK\r\nServer: nginx/1.18.0\r\nContent-Length: 0\r\n\r\n")
+
+
+def rdp_server(conn):
+    if conn.recv(1024)[:1] == b"\x03":
+        conn.sendall(RDP_CONFIRM)
+
+
+def silent_server(conn):
+    time.sleep(1.0)
+
+
+@pytest.fixture
+def servers():
+    servers = {name: LocalServer(handler) for name, handler in
+               (("ssh", ssh_server), ("http", http_server), ("rdp", rdp_server), ("silent", silent_server))}
+    yield servers
+    for server in servers.values():
+        server.close()
+
+
+def _fingerprinter(servers, cache):
+    config = {"fingerprint": {"timeout_ms": 300, "http_ports": [servers["http"].port],
+                              "rdp_ports": [servers["rdp"].port], "tls_ports": []}}
+    return ServiceFingerprinter(config, cache=cache)
+
+
+def _device(servers, names):
+    return {"ip": "127.0.0.1", "mac": "aa:bb:cc:dd:ee:ff", "open_ports": [servers[n].port for n in names]}
+
+
+def test_fingerprints_local_services(tmp_path, servers):
+    cache = FingerprintCache(path=str(tmp_path / "cache.json"))
+    device = _device(servers, ["ssh", "http", "rdp", "silent"])
+
+    assert _fingerprinter(servers, cache).fingerprint([device]) == 4
+    services = {s["port"]: s for s in device["services"]}
+    ssh, http, rdp, silent = (services[servers[n].port] for n in ("ssh", "http", "rdp", "silent"))
+
+    assert (ssh["service"], ssh["product"]) == ("ssh", "OpenSSH_8.9p1")
+    assert ssh["banner"].startswith("SSH-2.0-OpenSSH_8.9p1")
+    assert (http["service"], http["product"]) == ("http", "nginx/1.18.0")
+    assert (rdp["service"], rdp["product"]) == ("rdp", "CredSSP/NLA")
+    assert silent["service"] == "unknown"
+    assert [s["port"] for s in device["services"]] == sorted(services)
+
+
+def test_probes_run_concurrently(tmp_path, servers):
+    ports = [LocalServer(silent_server) for _ in range(6)]
+    try:
+        device = {"ip": "127.0.0.1", "mac": "Unknown", "open_ports": [s.port for s in ports]}
+        start = time.perf_counter()
+        _fingerprinter(servers, FingerprintCache(path=str(tmp_path / "cache.json"))).fingerprint([device])
+        # Each silent port costs two read timeouts (greeting, then HEAD); serially that would be 3.6s
+        assert time.perf_counter() - start < 2.0
+    finally:
+        for server in ports:
+            server.close()
+
+
+def test_cache_hit_skips_probes(tmp_path, servers):
+    path = str(tmp_path / "cache.json")
+    _fingerprinter(servers, FingerprintCache(path=path)).fingerprint([_device(servers, ["ssh", "http"])])
+    connections = servers["ssh"].connections + servers["http"].connections
+
+    device = _device(servers, ["ssh", "http"])
+    assert _fingerprinter(servers, FingerprintCache(path=path)).fingerprint([device]) == 0
+    assert servers["ssh"].connections + servers["http"].connections == connections
+    assert f"{servers['ssh'].port}/ssh OpenSSH_8.9p1" in [service_label(s) for s in device["services"]]
+
+
+def test_expired_entries_are_refreshed(tmp_path, servers):
+    cache = FingerprintCache(path=str(tmp_path / "cache.json"), ttl_hours=0)
+    _fingerprinter(servers, cache).fingerprint([_device(servers, ["ssh"])])
+    assert _fingerprinter(servers, cache).fingerprint([_device(servers, ["ssh"])]) == 1
+
+
+def test_reopened_port_is_fingerprinted_again(tmp_path, servers):
+    cache = FingerprintCache(path=str(tmp_path / "cache.json"))
+    fingerprinter = _fingerprinter(servers, cache)
+    fingerprinter.fingerprint([_device(servers, ["ssh", "http"])])
+
+    # http closes: prune drops its entry
+    fingerprinter.fingerprint([_device(servers, ["ssh"])])
+    assert f"aa:bb:cc:dd:ee:ff|{servers['http'].port}" not in cache.entries
+
+    # and reopens: it's probed again while ssh is still served from the cache
+    before = servers["http"].connections
+    assert fingerprinter.fingerprint([_device(servers, ["ssh", "http"])]) == 1
+    assert servers["http"].connections == before + 1
+
+
+def test_failed_probes_are_not_cached(tmp_path, servers):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        closed = s.getsockname()[1]
+    cache = FingerprintCache(path=str(tmp_path / "cache.json"))
+    fingerprinter = _fingerprinter(servers, cache)
+    device = {"ip": "127.0.0.1", "mac": "aa:bb:cc:dd:ee:ff", "open_ports": [closed, servers["ssh"].port]}
+
+    assert fingerprinter.fingerprint([device]) == 2
+    services = {s["port"]: s["service"] for s in device["services"]}
+    assert services == {closed: "unknown", servers["ssh"].port: "ssh"}
+    assert f"aa:bb:cc:dd:ee:ff|{closed}" not in cache.entries
+    # Only the failed port is tried again
+    assert fingerprinter.fingerprint([dict(device)]) == 1
+
+
+def test_device_moving_ip_is_fingerprinted_again(tmp_path, servers):
+    cache = FingerprintCache(path=str(tmp_path / "cache.json"))
+    fingerprinter = _fingerprinter(servers, cache)
+    fingerprinter.fingerprint([_device(servers, ["ssh"])])
+    key = f"aa:bb:cc:dd:ee:ff|{servers['ssh'].port}"
+    cache.entries[key]["ip"] = "127.0.0.2"
+    assert fingerprinter.fingerprint([_device(servers, ["ssh"])]) == 1
+
+
+def test_service_patterns():
+    device = {"services": [{"port": 22, "service": "ssh", "product": "OpenSSH_7.4"},
+                           {"port": 23, "service": "telnet", "product": None}]}
+    assert matched_services(device, ["telnet"]) == ["23/telnet"]
+    assert matched_services(device, ["*openssh_7.*"]) == ["22/ssh OpenSSH_7.4"]
+    assert matched_services(device, ["rdp"]) == []
@@ -1,14 +1,54 @@
 # utils/cli.py
 import argparse
+from report.schema import REPORT_FORMATS
 
-def parse_args():
+def _report_formats(value):
+    formats = [f.strip().lower() for f in value.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in REPORT_FORMATS]
+    if not formats or unknown:
+        raise argparse.ArgumentTypeError(f"invalid format(s) {unknown or value!r}; choose from {', '.join(REPORT_FORMATS)}")
+    return formats if len(formats) > 1 else formats[0]
+
+def parse_args(argv=None):
     parser = argparse.ArgumentParser(description="Skynet | Hein+Fricke © 2025")
     parser.add_argument('--ip', help='Scan a single IP address')
     parser.add_argument('--range', help='Override IP range/subnet (e.g. 192.168.1.0/24)')
-    parser.add_argument('--format', choices=['html', 'csv', 'json'], help='Output report format')
+    parser.add_argument('--format', type=_report_formats, help=f"Output report format(s), comma-separated ({', '.join(REPORT_FORMATS)})")
     parser.add_argument('--self', dest='self_scan', action='store_true', help='Scan only this machine')
     parser.add_argument('--weekly-summary', action='store_true', help='Send weekly summary email')
-    return parser.parse_args()
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted scan from its last checkpoint')
+
+    subparsers = parser.add_subparsers(dest='command')
+    check = subparsers.add_parser('check', help='Fast reachability check of one or a few hosts (no report, no email)')
+    check.add_argument('hosts', nargs='+', help='Host(s) to probe')
+    check.add_argument('--ports', type=int, nargs='*', help='Ports to probe (default: ports_to_check from config)')
+    check.add_argument('--timeout', type=float, default=1.0, help='Per-probe timeout in seconds (default: 1.0)')
+    check.add_argument('--quiet', '-q', action='store_true', help='Print nothing, only set the exit code')
+
+    inventory = subparsers.add_parser('inventory', help='Device inventory API server and query client')
+    inventory_sub = inventory.add_subparsers(dest='inventory_command', required=True)
+    inventory_sub.add_parser('serve', help='Serve the indexed inventory over a local HTTP/JSON API')
+    query = inventory_sub.add_parser('query', help='Query a running inventory server')
+    query.add_argument('--ip', dest='filter_ip', help='Exact IP address')
+    query.add_argument('--mac', help='MAC address (any case, : or - separated)')
+    query.add_argument('--vendor', help='Vendor name (exact, case-insensitive)')
+    query.add_argument('--hostname', help='Hostname (exact, case-insensitive)')
+    query.add_argument('--status', choices=['Reachable', 'Unreachable'], help='Device status')
+    query.add_argument('--site', help='Agent site (collector results)')
+    query.add_argument('--port', type=int, nargs='+', help='Open port(s); all must be open')
+    query.add_argument('--offset', type=int, default=0, help='Skip this many results')
+    query.add_argument('--limit', type=int, default=100, help='Maximum results to return')
+    query.add_argument('--json', action='store_true', help='Print the raw JSON response')
+
+    passive = subparsers.add_parser('passive', help='Passive ARP/DHCP/mDNS/NetBIOS discovery')
+    passive_source = passive.add_mutually_exclusive_group(required=True)
+    passive_source.add_argument('--listen', action='store_true', help='Sniff live traffic (Linux, needs root)')
+    passive_source.add_argument('--pcap', nargs='+', help='Ingest recorded pcap file(s) into the passive table')
+    passive.add_argument('--interface', help='Interface to sniff on (default: all)')
+
+    subparsers.add_parser('agent', help='Scan the local segment and ship results to the central collector')
+    subparsers.add_parser('collector', help='Receive agent results and run one merged report/alert stream')
+    return parser.parse_args(argv)
 
 def apply_overrides(config, args):
     if args.range:
@@ -19,4 +59,6 @@ def apply_overrides(config, args):
         config['ip_range'] = ""  # auto-detect in scanner
     if args.format:
         config['report_format'] = args.format
-    return config
\ No newline at end of file
+    if getattr(args, 'resume', False):
+        config['resume'] = True
+    return config
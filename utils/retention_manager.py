@@ -0,0 +1,219 @@
+# utils/retention_manager.py
+import gzip
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_FILE = 'reports/manifest.json'
+
+DEFAULT_POLICY = {
+    "max_age_days": 30,         # delete runs older than this
+    "max_runs": 2000,           # keep at most this many runs
+    "max_size_mb": 1024,        # keep total report+log size under this
+    "compress_after_days": 1,   # gzip artifacts older than this
+    "sweep_interval_hours": 24  # how often to prune untracked files in logs/ and reports/
+}
+
+# Files that live in the swept directories but are not per-run artifacts.
+PROTECTED_FILES = {'weekly_summary.json', 'manifest.json', 'latest_results.json', 'temp.file'}
+COMPRESSED_SUFFIXES = ('.gz', '.zst', '.parquet', '.skyc')
+SWEEP_DIRS = ('logs', 'reports')
+
+
+class RetentionManager:
+    """
+    Keeps reports/ and logs/ bounded and indexes every run in a small manifest.
+
+    The manifest maps run_id -> {timestamp, report, extra_reports, log, device counts, bytes}
+    and stores the latest run_id, so latest/historical lookups never list a directory.
+    Policies come from the optional "retention" section of config.json.
+    """
+    def __init__(self, config=None, manifest_file=MANIFEST_FILE):
+        self.policy = dict(DEFAULT_POLICY)
+        self.policy.update((config or {}).get('retention', {}))
+        self.manifest_file = manifest_file
+        self.manifest = self._load()
+
+    def _load(self):
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file, 'r') as f:
+                try:
+                    manifest = json.load(f)
+                    manifest.setdefault('runs', {})
+                    return manifest
+                except json.JSONDecodeError:
+                    logger.warning("Manifest is corrupt, starting a new one.")
+        return {"latest": None, "last_sweep": 0, "runs": {}}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.manifest_file) or '.', exist_ok=True)
+        tmp = f"{self.manifest_file}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp, self.manifest_file)
+
+    # --- Index ---
+
+    def record_run(self, report_file, log_file, results, extra_reports=None):
+        """
+        Add a finished scan cycle to the manifest and return its run_id.
+        extra_reports lists additional formats written by a multi-format run.
+        """
+        now = datetime.now()
+        run_id = now.strftime('%Y-%m-%d_%H-%M-%S')
+        entry = {
+            "timestamp": now.timestamp(),
+            "report": report_file,
+            "extra_reports": list(extra_reports or []),
+            "log": log_file,
+            "total_devices": len(results),
+            "reachable": len([d for d in results if d['status'] == 'Reachable']),
+            "unreachable": len([d for d in results if d['status'] == 'Unreachable']),
+        }
+        entry['bytes'] = _entry_size(entry)
+        self.manifest['runs'][run_id] = entry
+        self.manifest['latest'] = run_id
+        self._save()
+        return run_id
+
+    def latest_run(self):
+        run_id = self.manifest.get('latest')
+        return self.manifest['runs'].get(run_id) if run_id else None
+
+    def get_run(self, run_id):
+        return self.manifest['runs'].get(run_id)
+
+    def runs(self):
+        """Return (run_id, entry) pairs, oldest first."""
+        return list(self.manifest['runs'].items())
+
+    # --- Policies ---
+
+    def enforce(self):
+        """Apply compression, age, count and size policies; returns the number of runs removed."""
+        now = time.time()
+        runs = self.manifest['runs']
+        max_age = self.policy['max_age_days'] * 86400
+        compress_age = self.policy['compress_after_days'] * 86400
+
+        # The latest run is never removed, so there's always a report to seed lookups from
+        latest = self.manifest.get('latest')
+        expired = [rid for rid, entry in runs.items() if now - entry['timestamp'] > max_age and rid != latest]
+        expired_set = set(expired)
+        remaining = [rid for rid in runs if rid not in expired_set and rid != latest]
+        overflow = max(0, len(remaining) + (latest in runs) - self.policy['max_runs'])
+        expired += remaining[:overflow]
+
+        for rid in expired:
+            self._delete_run(rid)
+
+        for entry in runs.values():
+            if now - entry['timestamp'] > compress_age:
+                self._compress_run(entry)
+
+        budget = self.policy['max_size_mb'] * 1024 * 1024
+        total = sum(entry.get('bytes', 0) for entry in runs.values())
+        size_removed = 0
+        for rid in list(runs):
+            if total <= budget or rid == self.manifest.get('latest'):
+                break
+            total -= runs[rid].get('bytes', 0)
+            self._delete_run(rid)
+            size_removed += 1
+
+        if now - self.manifest.get('last_sweep', 0) > self.policy['sweep_interval_hours'] * 3600:
+            self._sweep_untracked(now - max_age)
+            self.manifest['last_sweep'] = now
+
+        self._save()
+        removed = len(expired) + size_removed
+        if removed:
+            logger.info(f"Retention removed {removed} old run(s).")
+        return removed
+
+    def _delete_run(self, run_id):
+        entry = self.manifest['runs'].pop(run_id, None)
+        if not entry:
+            return
+        for path in _entry_paths(entry):
+            _remove(path)
+        if self.manifest.get('latest') == run_id:
+            self.manifest['latest'] = next(reversed(self.manifest['runs']), None)
+
+    def _compress_run(self, entry):
+        changed = False
+        for key in ('report', 'log'):
+            compressed = _gzip_file(entry.get(key))
+            if compressed:
+                entry[key] = compressed
+                changed = True
+        extras = []
+        for path in entry.get('extra_reports', []):
+            compressed = _gzip_file(path)
+            extras.append(compressed or path)
+            changed = changed or bool(compressed)
+        entry['extra_reports'] = extras
+        if changed:
+            entry['bytes'] = _entry_size(entry)
+
+    def _sweep_untracked(self, cutoff):
+        """Prune files the manifest doesn't know about (e.g. per-module logs) once they pass max_age."""
+        tracked = {
+            os.path.normpath(path)
+            for entry in self.manifest['runs'].values()
+            for path in _entry_paths(entry)
+        }
+        for directory in SWEEP_DIRS:
+            if not os.path.isdir(directory):
+                continue
+            with os.scandir(directory) as it:
+                for item in it:
+                    if (
+                        item.is_file()
+                        and item.name not in PROTECTED_FILES
+                        and os.path.normpath(item.path) not in tracked
+                        and item.stat().st_mtime < cutoff
+                    ):
+                        _remove(item.path)
+
+
+def _entry_paths(entry):
+    paths = [entry.get('report'), entry.get('log')] + list(entry.get('extra_reports', []))
+    return [p for p in paths if p]
+
+
+def _entry_size(entry):
+    return sum(_size(p) for p in _entry_paths(entry))
+
+
+def _gzip_file(path):
+    """Gzip path in place and return the new path, or None if there was nothing to do."""
+    if not path or path.endswith(COMPRESSED_SUFFIXES) or not os.path.exists(path):
+        return None
+    with open(path, 'rb') as src, gzip.open(f"{path}.gz", 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(path)
+    return f"{path}.gz"
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path) if path else 0
+    except OSError:
+        return 0
+
+
+def _remove(path):
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove {path}: {e}")